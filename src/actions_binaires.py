@@ -0,0 +1,476 @@
+"""
+Format binaire compact pour les fichiers d'actions (addNode, removeNode,
+addEdge, removeEdge).
+
+Un fichier binaire commence par un en-tête de 16 octets :
+    - signature : b"ICAB"
+    - version   : uint32
+    - nombre d'enregistrements : uint64
+suivi d'enregistrements de largeur fixe (12 octets, little-endian) :
+    - op : opcode (uint32)
+    - u  : premier nœud (uint32)
+    - v  : second nœud (uint32, 0 pour les actions sur les nœuds)
+
+La relecture se fait par memory-mapping NumPy : aucun découpage de chaîne
+ni conversion 'nX' -> X n'est nécessaire au moment du rejeu.
+"""
+
+import numpy as np
+
+
+MAGIC = b"ICAB"
+VERSION = 1
+
+OP_ADD_NODE = 1
+OP_REMOVE_NODE = 2
+OP_ADD_EDGE = 3
+OP_REMOVE_EDGE = 4
+
+# Correspondance mot réservé <-> opcode
+OPCODES = {
+    "addNode": OP_ADD_NODE,
+    "removeNode": OP_REMOVE_NODE,
+    "addEdge": OP_ADD_EDGE,
+    "removeEdge": OP_REMOVE_EDGE,
+}
+NOMS_ACTIONS = {op: nom for nom, op in OPCODES.items()}
+
+HEADER_DTYPE = np.dtype([("magic", "S4"), ("version", "<u4"), ("count", "<u8")])
+RECORD_DTYPE = np.dtype([("op", "<u4"), ("u", "<u4"), ("v", "<u4")])
+
+# Nombre d'enregistrements décodés d'un coup lors du rejeu
+TAILLE_BLOC = 1 << 16
+
+
+# Largeur maximale d'un identifiant décimal (uint32 : 10 chiffres)
+_LARGEUR_ID = 10
+
+# Huit chiffres '0' en ASCII, et masques des conversions sur mots de 64 bits
+_ZEROS = np.uint64(0x3030303030303030)
+_QUARTETS_HAUTS = np.uint64(0xF0F0F0F0F0F0F0F0)
+_SIX = np.uint64(0x0606060606060606)
+_TOUS = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _vue_mots(buf: np.ndarray):
+    """
+    Vue sans copie des mots de 64 bits (little-endian) commençant à chaque
+    octet de buf : _vue_mots(buf)[i] contient les octets buf[i:i + 8].
+    """
+    return np.ndarray(shape=(len(buf) - 7,), dtype="<u8", buffer=buf, strides=(1,))
+
+
+def _entiers_horner(buf: np.ndarray, fin: np.ndarray, longueur: np.ndarray):
+    """
+    Chiffres lus colonne par colonne (schéma de Horner), les colonnes étant
+    alignées à droite sur la fin de chaque token.
+
+    Returns:
+        (ids, valides): entiers (int64) et masque des tokens tout en chiffres
+    """
+    # Tant que la colonne j est avant le token, ids reste à 0 : pas de masque
+    # nécessaire pour le schéma de Horner
+    ids = np.zeros(len(fin), dtype=np.int64)
+    valides = np.ones(len(fin), dtype=bool)
+    largeur = int(np.clip(longueur, 0, _LARGEUR_ID).max(initial=0))
+    for j in range(largeur, 0, -1):
+        dans_token = longueur >= j
+        chiffre = (buf[fin - j] - np.uint8(ord("0"))) * dans_token
+        valides &= chiffre <= 9
+        ids = ids * 10 + chiffre
+    return ids, valides
+
+
+def _entiers_mots(buf: np.ndarray, fin: np.ndarray, longueur: np.ndarray):
+    """
+    Tokens d'au plus 8 chiffres : les 8 octets finissant le token sont lus
+    en un mot de 64 bits, les octets avant le token remplacés par '0', puis
+    les chiffres sont combinés deux à deux, quatre à quatre et huit à huit
+    par multiplications sur le mot entier (SWAR).
+
+    Returns:
+        (ids, valides): entiers (uint64) et masque des tokens tout en chiffres
+    """
+    mots = _vue_mots(buf)[fin - 8]
+    # Le premier octet du token est à l'octet 8 - longueur du mot
+    garde = _TOUS << ((8 - np.clip(longueur, 1, 8)).astype(np.uint64) * np.uint64(8))
+    x = (mots & garde) | (_ZEROS & ~garde)
+    valides = (((x & _QUARTETS_HAUTS) == _ZEROS)
+               & (((x + _SIX) & _QUARTETS_HAUTS) == _ZEROS))
+    x -= _ZEROS
+    x = (x * np.uint64(10) + (x >> np.uint64(8))) & np.uint64(0x00FF00FF00FF00FF)
+    x = (x * np.uint64(100) + (x >> np.uint64(16))) & np.uint64(0x0000FFFF0000FFFF)
+    x = (x * np.uint64(10000) + (x >> np.uint64(32))) & np.uint64(0xFFFFFFFF)
+    return x, valides
+
+
+def _entiers_tokens(buf: np.ndarray, debut: np.ndarray, fin: np.ndarray):
+    """
+    Conversion vectorisée des tokens 'nX' / 'X' -> X (même règle que
+    lecteur_graphe.to_int), à partir de leurs positions dans le tampon.
+
+    Les tokens d'au plus 8 chiffres (cas courant) sont convertis par mots
+    de 64 bits (_entiers_mots), les plus longs colonne par colonne
+    (_entiers_horner). Le tampon doit être précédé de _LARGEUR_ID octets de
+    bourrage.
+
+    Returns:
+        (ids, valides): identifiants (uint32) et masque des tokens convertibles
+    """
+    debut = debut + (buf[debut] == ord("n"))
+    longueur = fin - debut
+    ids, chiffres = _entiers_mots(buf, fin, longueur)
+    valides = (longueur >= 1) & (longueur <= 8) & chiffres
+
+    longs = np.flatnonzero((longueur > 8) & (longueur <= _LARGEUR_ID))
+    if len(longs):
+        ids_longs, chiffres = _entiers_horner(buf, fin[longs], longueur[longs])
+        ids[longs] = ids_longs
+        valides[longs] = chiffres & (ids_longs <= 0xFFFFFFFF)
+
+    return np.where(valides, ids, 0).astype(np.uint32), valides
+
+
+def _codes_actions(buf: np.ndarray, debut: np.ndarray, fin: np.ndarray):
+    """
+    Code chaque token (au plus 16 octets) sur deux entiers 64 bits, les octets
+    au-delà du token étant mis à zéro : deux tokens sont égaux si et
+    seulement si leurs codes le sont.
+    """
+    mots = _vue_mots(buf)
+    longueur = np.minimum(fin - debut, 16).astype(np.uint64) * np.uint64(8)
+    bas = np.where(longueur >= 64, _TOUS, (np.uint64(1) << np.minimum(longueur, 63)) - np.uint64(1))
+    haut = np.where(longueur >= 128, _TOUS,
+                    (np.uint64(1) << np.clip(longueur, 64, 127) - np.uint64(64)) - np.uint64(1))
+    return mots[debut] & bas, mots[debut + 8] & haut
+
+
+def _code_mot(mot: bytes):
+    """Code de _codes_actions pour un mot connu."""
+    mots = np.frombuffer(mot.ljust(16, b"\0"), dtype="<u8")
+    return mots[0], mots[1]
+
+
+def _parser_tampon(data: bytes, premiere_ligne: int = 1):
+    """
+    Parse un bloc de texte (bytes, lignes complètes) en enregistrements RECORD_DTYPE.
+
+    Tout est fait sur le tampon d'octets : repérage des débuts/fins de tokens
+    et des changements de ligne par masques, reconnaissance des mots réservés
+    par comparaison d'entiers et conversion des identifiants colonne par
+    colonne. Aucune ligne n'est traitée individuellement en Python, sauf pour
+    formater les erreurs. Comme pour bytes.split(), les espaces, tabulations
+    et autres octets de contrôle séparent les tokens.
+
+    Returns:
+        (records, erreurs): enregistrements valides dans l'ordre du fichier et
+        liste triée de (numéro de ligne, message) pour les lignes ignorées
+    """
+    if not data.endswith(b"\n"):
+        data += b"\n"
+    nb_lignes = data.count(b"\n")
+    # Bourrage (des espaces) pour les fenêtres de lecture de largeur fixe
+    buf = np.frombuffer(b" " * _LARGEUR_ID + data + b" " * 16, dtype=np.uint8)
+
+    # Transitions séparateur <-> token : -1 au début d'un token, +1 après sa fin
+    transitions = np.diff((buf <= 32).view(np.int8))
+    bords = np.flatnonzero(transitions)
+    debut_tok = bords[0::2] + 1
+    fin_tok = bords[1::2] + 1
+    if len(debut_tok) == 0:
+        return np.empty(0, dtype=RECORD_DTYPE), []
+
+    # Nombre de fins de ligne entre un token et le précédent. Cas courant :
+    # un seul séparateur ; les intervalles plus longs (lignes vides, espaces
+    # en tête, '\r\n') sont comptés à part.
+    fin_prec = np.concatenate(([debut_tok[0] - 1], fin_tok[:-1]))
+    sauts = (buf[fin_prec] == ord("\n")).astype(np.int64)
+    sauts[0] = np.count_nonzero(buf[:debut_tok[0]] == ord("\n"))
+    longs = np.flatnonzero(debut_tok - fin_prec > 1)
+    if len(longs):
+        fins_lignes = np.flatnonzero(buf == ord("\n"))
+        sauts[longs] = (np.searchsorted(fins_lignes, debut_tok[longs])
+                        - np.searchsorted(fins_lignes, fin_prec[longs]))
+    ligne_tok = np.cumsum(sauts)
+    nb_tok = np.bincount(ligne_tok, minlength=nb_lignes)
+    premier_tok = np.cumsum(nb_tok) - nb_tok
+
+    erreurs = []
+    for i in np.flatnonzero((nb_tok == 1) | (nb_tok > 3)).tolist():
+        erreurs.append((premiere_ligne + i, "format invalide"))
+
+    lignes = np.flatnonzero((nb_tok == 2) | (nb_tok == 3))
+    nb_args = nb_tok[lignes] - 1
+    i_act = premier_tok[lignes]
+    a_deb, a_fin = debut_tok[i_act], fin_tok[i_act]
+
+    # Reconnaissance des mots réservés (même logique que lire_fichier :
+    # le nombre d'arguments choisit la famille d'opérations)
+    bas, haut = _codes_actions(buf, a_deb, a_fin)
+    ops = np.zeros(len(lignes), dtype=np.uint32)
+    for nom, code in OPCODES.items():
+        attendu = 1 if code in (OP_ADD_NODE, OP_REMOVE_NODE) else 2
+        code_bas, code_haut = _code_mot(nom.encode())
+        ops[(bas == code_bas) & (haut == code_haut) & (nb_args == attendu)] = code
+
+    u, u_ok = _entiers_tokens(buf, debut_tok[i_act + 1], fin_tok[i_act + 1])
+    i_v = np.where(nb_args == 2, i_act + 2, i_act + 1)
+    v, v_ok = _entiers_tokens(buf, debut_tok[i_v], fin_tok[i_v])
+    v[nb_args == 1] = 0
+    ids_ok = u_ok & (v_ok | (nb_args == 1))
+    valides = (ops != 0) & ids_ok
+
+    for i in np.flatnonzero(~valides).tolist():
+        ln = premiere_ligne + int(lignes[i])
+        if ops[i] == 0:
+            act = buf[a_deb[i]:a_fin[i]].tobytes().decode("utf-8", errors="replace")
+            erreurs.append((ln, f"opération inconnue '{act}'"))
+        else:
+            erreurs.append((ln, "identifiant de nœud invalide"))
+    erreurs.sort()
+
+    records = np.empty(int(valides.sum()), dtype=RECORD_DTYPE)
+    records["op"] = ops[valides]
+    records["u"] = u[valides]
+    records["v"] = v[valides]
+    return records, erreurs
+
+
+def encoder_actions(lines) -> np.ndarray:
+    """
+    Convertit des lignes d'actions texte ('addEdge n12 n34', ...) en tableau
+    d'enregistrements RECORD_DTYPE (parsing vectorisé).
+
+    Les lignes vides sont ignorées ; les lignes invalides sont signalées
+    comme dans lecteur_graphe.lire_fichier puis ignorées.
+    """
+    lignes = [l.encode("utf-8") if isinstance(l, str) else l for l in lines]
+    records, erreurs = _parser_tampon(b"\n".join(l.rstrip(b"\r\n") for l in lignes))
+    for ln, msg in erreurs:
+        print(f"Ligne {ln}: {msg} (ignorée)")
+    return records
+
+
+def iterer_actions_texte(nom_fichier, taille_bloc: int = 1 << 20):
+    """
+    Parse un fichier d'actions texte par gros blocs (~taille_bloc octets).
+
+    Chaque bloc (complété jusqu'à la fin de sa dernière ligne) est converti en
+    enregistrements RECORD_DTYPE par opérations NumPy vectorisées. Les lignes
+    invalides sont signalées avec leur numéro dans le fichier complet, comme
+    dans lecteur_graphe.lire_fichier.
+
+    Yields:
+        np.ndarray: enregistrements du bloc
+    """
+    premiere_ligne = 1
+    with open(nom_fichier, "rb") as f:
+        while True:
+            data = f.read(taille_bloc)
+            if not data:
+                break
+            if not data.endswith(b"\n"):
+                data += f.readline()
+            records, erreurs = _parser_tampon(data, premiere_ligne)
+            for ln, msg in erreurs:
+                print(f"Ligne {ln}: {msg} (ignorée)")
+            premiere_ligne += data.count(b"\n")
+            yield records
+
+
+def lire_actions_texte(nom_fichier, taille_bloc: int = 1 << 20) -> np.ndarray:
+    """Parse tout un fichier d'actions texte en un tableau RECORD_DTYPE."""
+    blocs = list(iterer_actions_texte(nom_fichier, taille_bloc))
+    if not blocs:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    return np.concatenate(blocs)
+
+
+def _derniers_instants(cles: np.ndarray, instants: np.ndarray):
+    """
+    Clés distinctes (triées) et dernier instant de chacune, pour des
+    événements donnés dans l'ordre chronologique.
+    """
+    if len(cles) == 0:
+        return cles, instants
+    ordre = np.argsort(cles, kind="stable")
+    cles, instants = cles[ordre], instants[ordre]
+    dernier = np.append(cles[1:] != cles[:-1], True)
+    return cles[dernier], instants[dernier]
+
+
+def _instant_de(cles_triees: np.ndarray, derniers: np.ndarray, requetes: np.ndarray):
+    """Dernier instant associé à chaque clé demandée (-1 si la clé est absente)."""
+    if len(cles_triees) == 0:
+        return np.full(len(requetes), -1, dtype=np.int64)
+    i = np.minimum(np.searchsorted(cles_triees, requetes), len(cles_triees) - 1)
+    return np.where(cles_triees[i] == requetes, derniers[i], -1)
+
+
+def _premiers_ajouts(cles: np.ndarray, instants: np.ndarray, barrieres: np.ndarray):
+    """
+    Pour des ajouts donnés dans l'ordre chronologique, garde le premier
+    ajout de chaque clé postérieur à sa barrière (dernière suppression).
+
+    Returns:
+        indices des ajouts retenus, dans l'ordre chronologique
+    """
+    retenus = np.flatnonzero(instants > barrieres)
+    if len(retenus) == 0:
+        return retenus
+    ordre = retenus[np.argsort(cles[retenus], kind="stable")]
+    premier = np.insert(cles[ordre][1:] != cles[ordre][:-1], 0, True)
+    return np.sort(ordre[premier])
+
+
+def etat_final(records: np.ndarray):
+    """
+    Graphe obtenu en appliquant les actions à un DynamicGraph vide, calculé
+    sans rejouer les actions une à une.
+
+    Mêmes règles que DynamicGraph : une arête n'est ajoutée que si ses deux
+    extrémités sont présentes et distinctes, et la suppression d'un nœud
+    supprime ses arêtes. Un nœud (une arête) est présent à la fin si un
+    ajout effectif suit sa dernière suppression (pour une arête : la
+    suppression de l'arête ou de l'une de ses extrémités) ; le premier de
+    ces ajouts fixe son rang, ce qui reproduit l'ordre d'insertion du
+    rejeu séquentiel.
+
+    Returns:
+        (noeuds, u, v): nœuds présents et extrémités des arêtes présentes
+        (tableaux uint32), dans l'ordre où le rejeu les aurait insérés
+    """
+    op = np.asarray(records["op"])
+    u = np.asarray(records["u"]).astype(np.int64)
+    v = np.asarray(records["v"]).astype(np.int64)
+    instants = np.arange(len(op), dtype=np.int64)
+
+    # Opérations sur les nœuds, triées par (nœud, instant) : la présence
+    # d'un nœud à l'instant t est donnée par sa dernière opération avant t
+    sur_noeud = np.flatnonzero((op == OP_ADD_NODE) | (op == OP_REMOVE_NODE))
+    ordre = sur_noeud[np.argsort(u[sur_noeud], kind="stable")]
+    cles_noeud = (u[ordre] << 32) | instants[ordre]
+    ajout_noeud = op[ordre] == OP_ADD_NODE
+
+    def present(x, t):
+        if len(cles_noeud) == 0:
+            return np.zeros(len(x), dtype=bool)
+        # Requêtes triées : la recherche dichotomique reste en cache
+        requetes = (x << 32) | t
+        ordre = np.argsort(requetes)
+        i = np.empty(len(requetes), dtype=np.int64)
+        i[ordre] = np.searchsorted(cles_noeud, requetes[ordre]) - 1
+        j = np.maximum(i, 0)
+        return (i >= 0) & (cles_noeud[j] >> 32 == x) & ajout_noeud[j]
+
+    suppr = op == OP_REMOVE_NODE
+    noeuds_supprimes, derniere_suppr_noeud = _derniers_instants(u[suppr], instants[suppr])
+
+    ajouts = np.flatnonzero(op == OP_ADD_NODE)
+    barrieres = _instant_de(noeuds_supprimes, derniere_suppr_noeud, u[ajouts])
+    noeuds = u[ajouts[_premiers_ajouts(u[ajouts], instants[ajouts], barrieres)]]
+
+    # Arêtes non orientées, clé (min, max)
+    a, b = np.minimum(u, v), np.maximum(u, v)
+    cles_arete = (a << 32) | b
+    suppr = (op == OP_REMOVE_EDGE) & (u != v)
+    aretes_supprimees, derniere_suppr_arete = _derniers_instants(cles_arete[suppr], instants[suppr])
+
+    ajouts = np.flatnonzero((op == OP_ADD_EDGE) & (u != v))
+    ajouts = ajouts[present(u[ajouts], ajouts) & present(v[ajouts], ajouts)]
+    barrieres = np.maximum.reduce([
+        _instant_de(aretes_supprimees, derniere_suppr_arete, cles_arete[ajouts]),
+        _instant_de(noeuds_supprimes, derniere_suppr_noeud, u[ajouts]),
+        _instant_de(noeuds_supprimes, derniere_suppr_noeud, v[ajouts]),
+    ])
+    aretes = ajouts[_premiers_ajouts(cles_arete[ajouts], instants[ajouts], barrieres)]
+
+    return (noeuds.astype(np.uint32), u[aretes].astype(np.uint32), v[aretes].astype(np.uint32))
+
+
+def ecrire_actions_binaires(records: np.ndarray, filepath):
+    """Écrit l'en-tête puis les enregistrements dans filepath."""
+    records = np.asarray(records, dtype=RECORD_DTYPE)
+
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header["magic"] = MAGIC
+    header["version"] = VERSION
+    header["count"] = len(records)
+
+    with open(filepath, "wb") as f:
+        f.write(header.tobytes())
+        f.write(records.tobytes())
+
+
+def convertir_texte_vers_binaire(src, dst) -> int:
+    """
+    Convertit un fichier d'actions texte en fichier binaire.
+
+    Returns:
+        int: nombre d'enregistrements écrits
+    """
+    records = lire_actions_texte(src)
+    ecrire_actions_binaires(records, dst)
+    return len(records)
+
+
+def lire_actions_binaires(filepath) -> np.ndarray:
+    """
+    Ouvre un fichier binaire d'actions en memory-mapping (lecture seule).
+
+    Returns:
+        np.memmap: tableau d'enregistrements RECORD_DTYPE
+    """
+    header = np.fromfile(filepath, dtype=HEADER_DTYPE, count=1)
+    if len(header) != 1 or header["magic"][0] != MAGIC:
+        raise ValueError(f"{filepath}: ce n'est pas un fichier d'actions binaire")
+    if header["version"][0] != VERSION:
+        raise ValueError(f"{filepath}: version {header['version'][0]} non supportée")
+
+    count = int(header["count"][0])
+    if count == 0:
+        return np.empty(0, dtype=RECORD_DTYPE)
+
+    return np.memmap(filepath, dtype=RECORD_DTYPE, mode="r",
+                     offset=HEADER_DTYPE.itemsize, shape=(count,))
+
+
+def rejouer_actions_binaires(filepath, incr, callback=None) -> int:
+    """
+    Rejoue un fichier binaire d'actions sur un moteur IncrementalClosenessArticle.
+
+    Les enregistrements sont décodés par blocs (conversion NumPy -> listes
+    Python en une seule opération par colonne) puis dispatchés par opcode.
+
+    Args:
+        filepath: fichier binaire d'actions
+        incr: moteur incrémental (add_node, remove_node,
+              add_undirected_edge, remove_undirected_edge)
+        callback: fonction optionnelle appelée avec le numéro d'étape (1..N)
+                  après chaque action (mesure de temps, export, ...)
+
+    Returns:
+        int: nombre d'actions rejouées
+    """
+    records = lire_actions_binaires(filepath)
+
+    dispatch = {
+        OP_ADD_NODE: lambda u, v: incr.add_node(u),
+        OP_REMOVE_NODE: lambda u, v: incr.remove_node(u),
+        OP_ADD_EDGE: incr.add_undirected_edge,
+        OP_REMOVE_EDGE: incr.remove_undirected_edge,
+    }
+
+    step = 0
+    for start in range(0, len(records), TAILLE_BLOC):
+        bloc = records[start:start + TAILLE_BLOC]
+        for op, u, v in zip(bloc["op"].tolist(), bloc["u"].tolist(), bloc["v"].tolist()):
+            action = dispatch.get(op)
+            if action is None:
+                raise ValueError(f"Enregistrement {step + 1}: opcode inconnu {op}")
+            action(u, v)
+            step += 1
+            if callback is not None:
+                callback(step)
+
+    return step
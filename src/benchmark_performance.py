@@ -9,6 +9,7 @@ Ce script :
 4. Génère des graphes de visualisation
 """
 
+import argparse
 import time
 import csv
 import os
@@ -21,16 +22,24 @@ sys.path.insert(0, str(Path(__file__).parent))
 from generateur_graphs import generate_barabasi_albert_actions
 from graph import DynamicGraph
 from incremental_closeness_article import IncrementalClosenessArticle
-from classical_closeness import compute_all_closeness_classical
+from classical_closeness import (compute_all_closeness_classical, creer_pool,
+                                 workers_depuis_environnement, VARIABLE_WORKERS)
 from lecteur_graphe import to_int
 
 
-def run_classical_benchmark(actions):
+def run_classical_benchmark(actions, workers=None, pool=None):
     """
     Exécute la méthode classique et mesure le temps.
     CALCULE LA CLOSENESS APRÈS CHAQUE ACTION (comparaison équitable).
+    workers: nombre de processus pour le recalcul (None = séquentiel)
+    pool: pool de processus réutilisé (creer_pool), créé hors de la mesure ;
+          None = un pool est créé pour ce run si workers > 1
     
     """
+    if pool is None and workers is not None and workers > 1:
+        with creer_pool(workers) as pool:
+            return run_classical_benchmark(actions, workers, pool)
+    
     G = DynamicGraph()
     
     start_time = time.time()
@@ -53,7 +62,7 @@ def run_classical_benchmark(actions):
             G.remove_edge(u, v)
         
         # Calculer closeness APRÈS CHAQUE ACTION
-        closeness = compute_all_closeness_classical(G.G)
+        closeness = compute_all_closeness_classical(G.G, workers=workers, pool=pool)
     
     elapsed_time = time.time() - start_time
     return elapsed_time, closeness
@@ -107,11 +116,17 @@ def verify_correctness(clos_class, clos_incr, tolerance=1e-5):
     return len(differences) == 0, max_diff, len(differences)
 
 
-def run_benchmark(graph_sizes, num_runs=3):
+def run_benchmark(graph_sizes, num_runs=3, workers=None, pool=None):
     """
     Exécute le benchmark sur différentes tailles de graphes.
+    workers: nombre de processus pour la méthode classique (None = séquentiel) ;
+    un seul pool (pool, ou créé ici) sert à toutes les configurations
     
     """
+    if pool is None and workers is not None and workers > 1:
+        with creer_pool(workers) as pool:
+            return run_benchmark(graph_sizes, num_runs, workers, pool)
+    
     results = []
     
     print("="*80)
@@ -139,7 +154,7 @@ def run_benchmark(graph_sizes, num_runs=3):
             
             # Benchmark classique
             print("Classique...", end=" ", flush=True)
-            time_class, clos_class = run_classical_benchmark(actions)
+            time_class, clos_class = run_classical_benchmark(actions, workers, pool)
             times_classical.append(time_class)
             
             # Benchmark incrémental
@@ -198,8 +213,14 @@ def save_results(results, output_file):
     print(f"\n✓ Résultats sauvegardés dans: {output_file}")
 
 
-def main():
-    """Point d'entrée principal du benchmark."""
+def main(workers=None):
+    """
+    Point d'entrée principal du benchmark.
+    workers: nombre de processus pour la méthode classique (None = variable
+    CLOSENESS_WORKERS, séquentiel si absente)
+    """
+    if workers is None:
+        workers = workers_depuis_environnement()
     
     # Créer le dossier results s'il n'existe pas
     results_dir = Path(__file__).parent.parent / "results"
@@ -225,10 +246,11 @@ def main():
     print("\nConfiguration du benchmark:")
     print(f"  Tailles de graphes: {[n for n, _ in graph_sizes]}")
     print(f"  Runs par configuration: {num_runs}")
+    print(f"  Processus (classique): {workers or 1}")
     print()
     
     # Exécuter le benchmark
-    results = run_benchmark(graph_sizes, num_runs)
+    results = run_benchmark(graph_sizes, num_runs, workers)
     
     # Sauvegarder les résultats
     output_file = results_dir / "benchmark_results.csv"
@@ -253,4 +275,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Benchmark classique / incrémental")
+    parser.add_argument("--workers", type=int, default=None,
+                        help=f"nombre de processus (défaut : variable {VARIABLE_WORKERS}, sinon séquentiel)")
+    args = parser.parse_args()
+    main(workers=args.workers)
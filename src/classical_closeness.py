@@ -1,6 +1,12 @@
+import contextlib
+import os
 import networkx as nx
+import numpy as np
+import multiprocessing as mp
 from collections import deque
 
+from graph import DynamicGraph
+
 def bfs_distances(graph, source):
     """
     BFS pour calculer les distances depuis source vers tous les autres nœuds
@@ -27,11 +33,387 @@ def bfs_distances(graph, source):
     return distances
 
 
-def compute_closeness_centrality(graph, node):
+def graph_to_csr(graph):
+    """
+    Convertit le graphe en tableaux CSR (Compressed Sparse Row).
+
+    Les voisins du i-ème nœud (dans l'ordre de graph.nodes()) sont
+    indices[indptr[i]:indptr[i+1]], exprimés en positions dans nodes.
+
+    Returns:
+        (nodes, indptr, indices): liste des nœuds et tableaux NumPy int64
+    """
+    nodes = list(graph.nodes())
+    position = {node: i for i, node in enumerate(nodes)}
+
+    degres = [len(graph[node]) for node in nodes]
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum(degres, out=indptr[1:])
+
+    indices = np.fromiter((position[v] for node in nodes for v in graph.neighbors(node)),
+                          dtype=np.int64, count=int(indptr[-1]))
+    return nodes, indptr, indices
+
+
+def _voisins_frontiere(indptr, indices, frontier):
+    """Concatène les listes de voisins (CSR) de tous les nœuds de la frontière."""
+    starts = indptr[frontier]
+    lengths = indptr[frontier + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return indices[:0]
+    # Positions starts[k] .. starts[k] + lengths[k] - 1 pour chaque k, sans boucle
+    offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return indices[offsets + np.arange(total)]
+
+
+def bfs_distances_csr(indptr, indices, source):
+    """
+    BFS par frontières sur un graphe CSR : chaque niveau est traité en
+    une seule fois par opérations NumPy.
+
+    Args:
+        indptr, indices: graphe au format CSR (voir graph_to_csr)
+        source: position de la source dans nodes
+
+    Returns:
+        np.ndarray: dist[i] = distance de source à i, -1 si non atteignable
+    """
+    dist = np.full(len(indptr) - 1, -1, dtype=np.int64)
+    dist[source] = 0
+    frontier = np.array([source], dtype=np.int64)
+    level = 0
+
+    while len(frontier):
+        level += 1
+        voisins = _voisins_frontiere(indptr, indices, frontier)
+        voisins = voisins[dist[voisins] < 0]
+        dist[voisins] = level
+        frontier = np.flatnonzero(dist == level) if len(voisins) else voisins
+
+    return dist
+
+
+# Nombre de prédécesseurs testés un par un avant de tester le reste d'un bloc
+PASSES_ASCENDANTES = 4
+
+
+def _etape_ascendante(p_indptr, p_indices, candidats, in_frontier):
+    """
+    Niveau ascendant : renvoie les candidats dont un prédécesseur est dans la
+    frontière. Les premiers prédécesseurs sont testés colonne par colonne, en
+    retirant les candidats dès qu'un parent est trouvé (l'arrêt anticipé du
+    BFS ascendant) ; seuls les candidats restants parcourent toute leur liste.
+    """
+    curseur = p_indptr[candidats].copy()
+    fin = p_indptr[candidats + 1]
+    trouves = []
+
+    for _ in range(PASSES_ASCENDANTES):
+        atteint = in_frontier[p_indices[curseur]]
+        trouves.append(candidats[atteint])
+        curseur += 1
+        reste = ~atteint & (curseur < fin)
+        candidats, curseur, fin = candidats[reste], curseur[reste], fin[reste]
+        if not len(candidats):
+            return np.concatenate(trouves)
+
+    longueurs = fin - curseur
+    offsets = np.repeat(curseur - (np.cumsum(longueurs) - longueurs), longueurs)
+    atteint = np.logical_or.reduceat(in_frontier[p_indices[offsets + np.arange(int(longueurs.sum()))]],
+                                     np.cumsum(longueurs) - longueurs)
+    trouves.append(candidats[atteint])
+    return np.concatenate(trouves)
+
+
+# Seuils de Beamer et al. : passage en ascendant quand les arcs sortant de la
+# frontière dépassent 1/ALPHA des arcs non explorés, retour en descendant quand
+# la frontière tombe sous n/BETA nœuds
+DIRECTION_ALPHA = 14
+DIRECTION_BETA = 24
+
+
+def direction_optimizing_bfs_csr(indptr, indices, source, predecessors=None,
+                                 alpha=DIRECTION_ALPHA, beta=DIRECTION_BETA):
+    """
+    BFS à direction optimisée (Beamer) sur un graphe CSR.
+
+    Les niveaux étroits sont explorés en descendant (voisins de la frontière) ;
+    les niveaux larges, typiques du milieu d'un BFS sur un graphe sans échelle,
+    le sont en ascendant : chaque nœud non visité cherche un prédécesseur dans
+    la frontière, ce qui évite de parcourir les arcs vers des nœuds déjà vus.
+
+    Args:
+        indptr, indices: graphe au format CSR (voir graph_to_csr)
+        source: position de la source dans nodes
+        predecessors: CSR transposé (indptr, indices) déjà calculé, optionnel
+        alpha, beta: seuils de changement de direction
+
+    Returns:
+        np.ndarray: dist[i] = distance de source à i, -1 si non atteignable
+    """
+    if predecessors is None:
+        predecessors = transpose_csr(indptr, indices)
+    p_indptr, p_indices = predecessors
+
+    n = len(indptr) - 1
+    degres = np.diff(indptr)
+    dist = np.full(n, -1, dtype=np.int64)
+    dist[source] = 0
+    in_frontier = np.zeros(n, dtype=bool)
+    frontier = np.array([source], dtype=np.int64)
+    # Seuls les nœuds ayant un prédécesseur peuvent être atteints
+    candidats = np.flatnonzero(np.diff(p_indptr) > 0)
+    candidats = candidats[candidats != source]
+    arcs_restants = int(degres.sum()) - int(degres[source])
+    ascendant = False
+    level = 0
+
+    while len(frontier):
+        level += 1
+        arcs_frontiere = int(degres[frontier].sum())
+        if not ascendant and arcs_frontiere > arcs_restants / alpha:
+            ascendant = True
+        elif ascendant and len(frontier) < n / beta:
+            ascendant = False
+
+        if ascendant:
+            candidats = candidats[dist[candidats] < 0]
+            if not len(candidats):
+                break
+            in_frontier[frontier] = True
+            suivants = _etape_ascendante(p_indptr, p_indices, candidats, in_frontier)
+            in_frontier[frontier] = False
+            frontier = suivants
+            dist[frontier] = level
+        else:
+            voisins = _voisins_frontiere(indptr, indices, frontier)
+            voisins = voisins[dist[voisins] < 0]
+            dist[voisins] = level
+            frontier = np.flatnonzero(dist == level) if len(voisins) else voisins
+
+        arcs_restants -= int(degres[frontier].sum())
+
+    return dist
+
+
+def multi_source_bfs_sums(indptr, indices, sources):
+    """
+    BFS par frontières depuis plusieurs sources à la fois : la frontière est
+    un ensemble de paires (source, nœud), ce qui partage le coût des appels
+    NumPy entre toutes les sources du lot.
+
+    Args:
+        indptr, indices: graphe au format CSR (voir graph_to_csr)
+        sources: positions des sources dans nodes
+
+    Returns:
+        (reachable, total): pour chaque source, nombre de nœuds atteignables
+        (hors source) et somme des distances (tableaux int64)
+    """
+    n = len(indptr) - 1
+    sources = np.asarray(sources, dtype=np.int64)
+    b = len(sources)
+    visited = np.zeros(b * n, dtype=bool)
+    # Dédoublonnage sans tri : chaque clé garde l'indice de sa dernière écriture
+    stamp = np.empty(b * n, dtype=np.int64)
+    reachable = np.zeros(b, dtype=np.int64)
+    total = np.zeros(b, dtype=np.int64)
+
+    # Une paire (k, v) est codée k * n + v
+    frontier = np.arange(b, dtype=np.int64) * n + sources
+    visited[frontier] = True
+    level = 0
+
+    while len(frontier):
+        level += 1
+        lot, noeud = np.divmod(frontier, n)
+        starts = indptr[noeud]
+        lengths = indptr[noeud + 1] - starts
+        nb = int(lengths.sum())
+        if nb == 0:
+            break
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        cles = np.repeat(lot * n, lengths) + indices[offsets + np.arange(nb)]
+        cles = cles[~visited[cles]]
+        rang = np.arange(len(cles))
+        stamp[cles] = rang
+        cles = cles[stamp[cles] == rang]
+        visited[cles] = True
+        comptes = np.bincount(cles // n, minlength=b)
+        reachable += comptes
+        total += level * comptes
+        frontier = cles
+
+    return reachable, total
+
+
+def transpose_csr(indptr, indices):
+    """
+    Transpose un graphe CSR : les listes de successeurs deviennent des listes
+    de prédécesseurs (identique pour un graphe non orienté).
+    """
+    n = len(indptr) - 1
+    origines = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))
+    ordre = np.argsort(indices, kind="stable")
+    t_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=n), out=t_indptr[1:])
+    return t_indptr, origines[ordre]
+
+
+def bitset_bfs_levels(indptr, indices, sources, predecessors=None):
+    """
+    BFS bit-parallèle depuis au plus 64 sources (graphes non pondérés).
+
+    Chaque nœud porte un mot de 64 bits : le bit k indique « atteint depuis
+    sources[k] ». L'expansion d'un niveau est un OU bit à bit des mots de
+    frontière des prédécesseurs (np.bitwise_or.reduceat sur le CSR transposé).
+
+    Args:
+        indptr, indices: graphe au format CSR (voir graph_to_csr)
+        sources: au plus 64 positions de sources distinctes
+        predecessors: CSR transposé (indptr, indices) déjà calculé, optionnel
+
+    Yields:
+        (level, nouveaux): nouveaux[v] a le bit k à 1 si d(sources[k], v) == level
+    """
+    if len(sources) > 64:
+        raise ValueError("Au plus 64 sources par passe bit-parallèle")
+    if predecessors is None:
+        predecessors = transpose_csr(indptr, indices)
+    p_indptr, p_indices = predecessors
+
+    n = len(indptr) - 1
+    non_vides = np.flatnonzero(np.diff(p_indptr) > 0)
+    debuts = p_indptr[non_vides]
+
+    frontier = np.zeros(n, dtype=np.uint64)
+    frontier[np.asarray(sources, dtype=np.int64)] = np.uint64(1) << np.arange(len(sources), dtype=np.uint64)
+    visited = frontier.copy()
+    level = 0
+    yield level, frontier
+
+    while len(debuts):
+        level += 1
+        suivant = np.zeros(n, dtype=np.uint64)
+        suivant[non_vides] = np.bitwise_or.reduceat(frontier[p_indices], debuts)
+        frontier = suivant & ~visited
+        if not frontier.any():
+            break
+        visited |= frontier
+        yield level, frontier
+
+
+def bits_par_source(mots, nb_sources):
+    """
+    Déplie des mots de 64 bits en matrice booléenne (n, nb_sources) :
+    colonne k = bit k (source k).
+    """
+    octets = mots.astype("<u8").view(np.uint8).reshape(len(mots), 8)
+    return np.unpackbits(octets, axis=1, bitorder="little")[:, :nb_sources]
+
+
+def bitset_bfs_sums(indptr, indices, sources, predecessors=None):
+    """
+    Nombre de nœuds atteignables et somme des distances pour au plus 64 sources,
+    par comptage de bits (popcount par source) à chaque niveau du BFS bit-parallèle.
+
+    Returns:
+        (reachable, total): tableaux int64 alignés sur sources
+    """
+    reachable = np.zeros(len(sources), dtype=np.int64)
+    total = np.zeros(len(sources), dtype=np.int64)
+    for level, nouveaux in bitset_bfs_levels(indptr, indices, sources, predecessors):
+        if level == 0:
+            continue
+        comptes = bits_par_source(nouveaux, len(sources)).sum(axis=0, dtype=np.int64)
+        reachable += comptes
+        total += level * comptes
+    return reachable, total
+
+
+def _closeness_from_sums(reachable, total_distance, n):
+    """
+    Formule de compute_closeness_centrality à partir du nombre de nœuds
+    atteignables (hors source) et de la somme des distances.
+    """
+    if n <= 1 or reachable == 0 or total_distance == 0:
+        return 0.0
+    closeness = reachable / total_distance
+    return closeness * (reachable / (n - 1))
+
 
+def est_pondere(graph):
+    """Vrai si une arête du graphe a un poids (attribut 'weight') différent de 1."""
+    return any(c != 1 for _, _, c in graph.edges(data='weight', default=1))
+
+
+def dijkstra_sums(graph, nodes):
+    """
+    Nombre de nœuds atteignables (hors source) et somme des distances
+    pondérées depuis chaque nœud de nodes, par Dijkstra.
+
+    Returns:
+        (reachable, total): listes alignées sur nodes
+    """
+    reachable, total = [], []
+    for node in nodes:
+        distances = nx.single_source_dijkstra_path_length(graph, node, weight='weight')
+        reachable.append(len(distances) - 1)
+        total.append(sum(distances.values()))
+    return reachable, total
+
+
+def preparer_direction(graph):
+    """
+    Tableaux du BFS à direction optimisée, à calculer une fois puis passer à
+    compute_closeness_centrality(..., algorithm="direction", csr=...).
+
+    Returns:
+        (position, indptr, indices, predecessors): position[node] = indice CSR
+
+    Lève ValueError pour un graphe pondéré : le CSR ne garde pas les poids.
+    """
+    if est_pondere(graph):
+        raise ValueError("graphe pondéré : le BFS à direction optimisée compte les sauts")
+    nodes, indptr, indices = graph_to_csr(graph)
+    position = {node: i for i, node in enumerate(nodes)}
+    return position, indptr, indices, transpose_csr(indptr, indices)
+
+
+def compute_closeness_centrality(graph, node, algorithm="bfs", csr=None):
+    """
+    Closeness d'un seul nœud. Avec algorithm="direction", csr est le
+    résultat de preparer_direction(graph) : la conversion du graphe coûte
+    bien plus qu'un BFS, elle doit être partagée entre les requêtes (sans
+    csr, elle est refaite à chaque appel).
+
+    Comme dans compute_all_closeness_classical, un graphe pondéré est
+    traité par Dijkstra quel que soit algorithm (preparer_direction refuse
+    les graphes pondérés, un csr fourni vient donc d'un graphe non pondéré).
+    """
     if graph.number_of_nodes() <= 1:
         return 0.0
+    if algorithm not in ("bfs", "direction"):
+        raise ValueError(f"Algorithme inconnu: {algorithm}")
+    
+    if csr is None and est_pondere(graph):
+        reachable, total = dijkstra_sums(graph, [node])
+        return _closeness_from_sums(reachable[0], total[0], graph.number_of_nodes())
     
+    if algorithm == "direction":
+        # BFS à direction optimisée sur le graphe converti en tableaux CSR
+        if csr is None:
+            csr = preparer_direction(graph)
+        position, indptr, indices, predecessors = csr
+        dist = direction_optimizing_bfs_csr(indptr, indices, position[node], predecessors)
+        atteints = dist[dist > 0]
+        return _closeness_from_sums(len(atteints), int(atteints.sum()), len(position))
+    return _closeness_bfs(graph, node)
+
+
+def _closeness_bfs(graph, node):
+    """Closeness d'un nœud par BFS (distances en nombre de sauts)."""
     distances = bfs_distances(graph, node)
     
     # Nombre de nœuds atteignables (excluant le nœud lui-même)
@@ -57,26 +439,358 @@ def compute_closeness_centrality(graph, node):
     return closeness
 
 
-def compute_all_closeness_classical(graph, verbose=False):
+# En dessous de ce nombre de nœuds, lancer un pool de processus coûte plus
+# cher que le calcul lui-même
+SEUIL_PARALLELE = 1024
+
+# Graphe CSR du calcul en cours dans un processus de travail (voir _init_worker)
+_CSR_WORKER = None
+
+# Variable d'environnement lue par les points d'entrée quand --workers est absent
+VARIABLE_WORKERS = "CLOSENESS_WORKERS"
+
+
+def _taille_lot(algorithm, total):
+    """Nombre de sources traitées ensemble par le noyau choisi."""
+    if algorithm == "bitset":
+        return 64  # 64 sources par mot machine
+    if algorithm == "direction":
+        return 64  # une source à la fois ; le lot ne fixe que la granularité
+    # Lots limités à ~4M paires (source, nœud)
+    return max(1, min(256, (1 << 22) // max(total, 1)))
+
+
+def _sums_range(csr, algorithm, debut, fin):
+    """
+    Nombre de nœuds atteignables et somme des distances pour les sources
+    debut..fin-1 (positions CSR), par lots.
+
+    Returns:
+        (reachable, total): tableaux int64 de longueur fin - debut
+    """
+    indptr, indices, predecessors = csr
+    n = len(indptr) - 1
+    taille_lot = _taille_lot(algorithm, n)
+    morceaux_r, morceaux_t = [], []
+
+    for d in range(debut, fin, taille_lot):
+        sources = np.arange(d, min(d + taille_lot, fin))
+        if algorithm == "bitset":
+            r, t = bitset_bfs_sums(indptr, indices, sources, predecessors)
+        elif algorithm == "direction":
+            r = np.zeros(len(sources), dtype=np.int64)
+            t = np.zeros(len(sources), dtype=np.int64)
+            for k, source in enumerate(sources):
+                dist = direction_optimizing_bfs_csr(indptr, indices, source, predecessors)
+                atteints = dist[dist > 0]
+                r[k], t[k] = len(atteints), atteints.sum()
+        else:
+            r, t = multi_source_bfs_sums(indptr, indices, sources)
+        morceaux_r.append(r)
+        morceaux_t.append(t)
+
+    if not morceaux_r:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(morceaux_r), np.concatenate(morceaux_t)
+
+
+def _init_worker(csr):
+    """
+    Initialise un processus de travail avec le graphe CSR. Avec 'fork', les
+    tableaux sont hérités du parent sans copie ; avec 'spawn', ils sont
+    sérialisés une seule fois par processus.
+    """
+    global _CSR_WORKER
+    _CSR_WORKER = csr
+
+
+def _worker_sums(tache):
+    """
+    Tâche d'un processus de travail : sommes pour une tranche de sources,
+    sur le graphe CSR joint à la tâche (pool réutilisé) ou sur celui reçu
+    par _init_worker (pool créé pour un seul calcul).
+    """
+    algorithm, debut, fin, csr = tache
+    reachable, total = _sums_range(_CSR_WORKER if csr is None else csr, algorithm, debut, fin)
+    return debut, reachable, total
+
+
+def _contexte_processus():
+    """Contexte multiprocessing : 'fork' quand il existe (Linux), sinon 'spawn'."""
+    if "fork" in mp.get_all_start_methods():
+        return mp.get_context("fork")
+    return mp.get_context("spawn")
+
+
+def creer_pool(workers):
+    """
+    Pool de processus à réutiliser d'un calcul à l'autre (paramètre pool de
+    compute_all_closeness_classical et ScopedClassicalGraph), à ouvrir avec
+    « with creer_pool(workers) as pool: ». Pour workers None ou 1, un
+    contexte vide qui donne pool = None (calcul séquentiel).
+    """
+    if workers is None or workers <= 1:
+        return contextlib.nullcontext()
+    return _contexte_processus().Pool(workers)
+
+
+def workers_depuis_environnement():
+    """Nombre de processus donné par CLOSENESS_WORKERS (None si absente ou vide)."""
+    valeur = os.environ.get(VARIABLE_WORKERS, "").strip()
+    if not valeur:
+        return None
+    try:
+        return int(valeur)
+    except ValueError:
+        raise ValueError(f"{VARIABLE_WORKERS} doit être un entier, pas {valeur!r}") from None
+
+
+def _sums_toutes_sources(csr, algorithm, total, workers=None, pool=None, verbose=False):
+    """
+    Nombre de nœuds atteignables et somme des distances pour les sources
+    0..total-1 d'un graphe CSR. Avec workers > 1 (et au moins
+    SEUIL_PARALLELE nœuds), les sources sont réparties en tranches entre
+    les processus : ceux de pool s'il est fourni (le CSR est alors joint à
+    chaque tranche), sinon ceux d'un pool créé pour ce calcul, qui
+    reçoivent le CSR une seule fois.
+
+    Returns:
+        (reachable, total): tableaux int64 alignés sur les positions CSR
+    """
+    reachable = np.zeros(total, dtype=np.int64)
+    distances = np.zeros(total, dtype=np.int64)
+    taille_lot = _taille_lot(algorithm, total)
+    
+    if workers is not None and workers > 1 and total >= SEUIL_PARALLELE:
+        # ~4 tranches par processus (alignées sur les lots) pour équilibrer la charge
+        nb_tranches = workers * 4
+        pas = max(taille_lot, -(-total // nb_tranches // taille_lot) * taille_lot)
+        joint = csr if pool is not None else None
+        taches = [(algorithm, d, min(d + pas, total), joint) for d in range(0, total, pas)]
+        
+        if pool is None:
+            contexte = _contexte_processus().Pool(workers, initializer=_init_worker, initargs=(csr,))
+        else:
+            contexte = contextlib.nullcontext(pool)
+        with contexte as processus:
+            for fait, (debut, r, t) in enumerate(processus.imap_unordered(_worker_sums, taches), 1):
+                reachable[debut:debut + len(r)] = r
+                distances[debut:debut + len(t)] = t
+                if verbose:
+                    print(f"  Progression: {fait}/{len(taches)} tranches traitées")
+    else:
+        for debut in range(0, total, taille_lot):
+            fin = min(debut + taille_lot, total)
+            reachable[debut:fin], distances[debut:fin] = _sums_range(csr, algorithm, debut, fin)
+            if verbose:
+                print(f"  Progression: {fin}/{total} nœuds traités ({100*fin/total:.1f}%)")
+    return reachable, distances
+
+
+def compute_all_closeness_classical(graph, verbose=False, algorithm="csr", workers=None, pool=None):
     """
     Calcule la closeness centrality de TOUS les nœuds avec l'algo classique
     
+    Args:
+        graph: networkx.Graph / DiGraph
+        verbose: afficher la progression
+        algorithm: "csr" (défaut) convertit une fois le graphe en tableaux CSR
+                   puis fait des BFS par frontières NumPy, par lots de sources ;
+                   "bitset" fait un BFS bit-parallèle sur 64 sources à la fois
+                   (distances non pondérées) ;
+                   "direction" fait un BFS à direction optimisée (descendant /
+                   ascendant selon la taille de la frontière) par source ;
+                   "bfs" fait un BFS (bfs_distances) nœud par nœud.
+                   Tous donnent exactement les mêmes valeurs.
+        workers: nombre de processus (None ou 1 = séquentiel). Les sources sont
+                 réparties en tranches entre les processus, qui reçoivent une
+                 seule fois le graphe CSR. Ignoré pour "bfs" et pour les graphes
+                 de moins de SEUIL_PARALLELE nœuds.
+        pool: pool de creer_pool(workers) réutilisé d'un appel à l'autre (un
+              recalcul par étape ne relance pas ses processus) ; None = un
+              pool est créé pour cet appel si workers > 1.
+
+    Les noyaux BFS comptent les sauts : un graphe dont une arête a un poids
+    différent de 1 est traité par Dijkstra (dijkstra_sums), quel que soit
+    algorithm.
     """
-    closeness = {}
-    nodes = list(graph.nodes())
+    if est_pondere(graph):
+        nodes = list(graph.nodes())
+        reachable, total = dijkstra_sums(graph, nodes)
+        return {node: _closeness_from_sums(r, t, len(nodes))
+                for node, r, t in zip(nodes, reachable, total)}
+    
+    if algorithm == "bfs":
+        closeness = {}
+        nodes = list(graph.nodes())
+        total = len(nodes)
+        
+        for i, node in enumerate(nodes, 1):
+            closeness[node] = _closeness_bfs(graph, node)
+            if verbose and i % 20 == 0:  # Afficher tous les 20 nœuds
+                print(f"  Progression: {i}/{total} nœuds traités ({100*i/total:.1f}%)")
+        
+        if verbose and total > 0:
+            print(f"  Terminé: {total}/{total} nœuds traités (100.0%)")
+        
+        return closeness
+    
+    if algorithm not in ("csr", "bitset", "direction"):
+        raise ValueError(f"Algorithme inconnu: {algorithm}")
+    
+    nodes, indptr, indices = graph_to_csr(graph)
     total = len(nodes)
+    predecessors = transpose_csr(indptr, indices) if algorithm in ("bitset", "direction") else None
+    csr = (indptr, indices, predecessors)
     
-    for i, node in enumerate(nodes, 1):
-        closeness[node] = compute_closeness_centrality(graph, node)
-        if verbose and i % 20 == 0:  # Afficher tous les 20 nœuds
-            print(f"  Progression: {i}/{total} nœuds traités ({100*i/total:.1f}%)")
+    reachable, distances = _sums_toutes_sources(csr, algorithm, total, workers, pool, verbose)
     
     if verbose and total > 0:
         print(f"  Terminé: {total}/{total} nœuds traités (100.0%)")
     
+    closeness = {}
+    for node, r, d in zip(nodes, reachable.tolist(), distances.tolist()):
+        closeness[node] = _closeness_from_sums(r, d, total)
     return closeness
 
 
+class ScopedClassicalGraph(DynamicGraph):
+    """
+    Graphe dynamique pour un calcul classique restreint aux composantes.
+
+    Une action ne change les distances qu'à l'intérieur de la composante
+    connexe qu'elle touche : seules les sources de cette composante sont
+    recalculées par BFS. Pour les autres composantes, on garde le nombre de
+    nœuds atteignables et la somme des distances, et seule la normalisation
+    par n - 1 est réappliquée.
+
+    Les composantes sont suivies par union-find (fusion à l'insertion d'une
+    arête) et ré-étiquetées par parcours lors d'une suppression.
+
+    workers et pool ont le sens de compute_all_closeness_classical : le
+    recalcul d'une composante d'au moins SEUIL_PARALLELE nœuds est réparti
+    entre les processus.
+    """
+
+    def __init__(self, algorithm="csr", workers=None, pool=None):
+        super().__init__()
+        self.algorithm = algorithm
+        self.workers = workers
+        self.pool = pool
+        self.parent = {}    # union-find : nœud -> parent
+        self.membres = {}   # racine -> ensemble des nœuds de la composante
+        self.sums = {}      # nœud -> (atteignables, somme des distances)
+
+    def find(self, node):
+        """Racine de la composante de node (avec compression de chemin)."""
+        racine = node
+        while self.parent[racine] != racine:
+            racine = self.parent[racine]
+        while self.parent[node] != racine:
+            self.parent[node], node = racine, self.parent[node]
+        return racine
+
+    def _recompute(self, racine):
+        """Recalcule les sommes de distances de toutes les sources d'une composante."""
+        membres = self.membres[racine]
+        if len(membres) == 1:
+            for node in membres:
+                self.sums[node] = (0, 0)
+            return
+        sous_graphe = self.G.subgraph(membres)
+        if est_pondere(sous_graphe):
+            nodes = list(sous_graphe)
+            for node, r, t in zip(nodes, *dijkstra_sums(sous_graphe, nodes)):
+                self.sums[node] = (r, t)
+            return
+        nodes, indptr, indices = graph_to_csr(sous_graphe)
+        predecessors = transpose_csr(indptr, indices) if self.algorithm in ("bitset", "direction") else None
+        reachable, total = _sums_toutes_sources((indptr, indices, predecessors), self.algorithm,
+                                                len(nodes), self.workers, self.pool)
+        for node, r, t in zip(nodes, reachable.tolist(), total.tolist()):
+            self.sums[node] = (r, t)
+
+    def _relabel(self, membres):
+        """
+        Ré-étiquette un ensemble de nœuds (ancienne composante) en ses
+        composantes connexes actuelles et recalcule chacune d'elles.
+        """
+        restants = set(membres)
+        while restants:
+            racine = restants.pop()
+            composante = nx.node_connected_component(self.G, racine)
+            restants -= composante
+            for node in composante:
+                self.parent[node] = racine
+            self.membres[racine] = set(composante)
+            self._recompute(racine)
+
+    def add_node(self, node_id: int):
+        node_id = int(node_id)
+        if node_id in self.G:
+            return
+        super().add_node(node_id)
+        self.parent[node_id] = node_id
+        self.membres[node_id] = {node_id}
+        self.sums[node_id] = (0, 0)
+
+    def remove_node(self, node_id: int):
+        node_id = int(node_id)
+        if node_id not in self.G:
+            return
+        racine = self.find(node_id)
+        membres = self.membres.pop(racine)
+        super().remove_node(node_id)
+        membres.discard(node_id)
+        for node in membres:
+            self.parent[node] = node
+        del self.parent[node_id]
+        del self.sums[node_id]
+        self._relabel(membres)
+
+    def add_edge(self, u: int, v: int):
+        u, v = int(u), int(v)
+        if self.G.has_edge(u, v):
+            if 'weight' in self.G[u][v]:
+                # Ré-ajout d'une arête pondérée : retour au poids 1
+                super().add_edge(u, v)
+                self._recompute(self.find(u))
+            return
+        super().add_edge(u, v)
+        if not self.G.has_edge(u, v):
+            return
+        ru, rv = self.find(u), self.find(v)
+        if ru != rv:
+            # Union par taille : la petite composante rejoint la grande
+            if len(self.membres[ru]) < len(self.membres[rv]):
+                ru, rv = rv, ru
+            self.parent[rv] = ru
+            self.membres[ru] |= self.membres.pop(rv)
+        self._recompute(ru)
+
+    def update_edge_weight(self, u: int, v: int, weight):
+        u, v = int(u), int(v)
+        super().update_edge_weight(u, v, weight)
+        if self.G.has_edge(u, v):
+            self._recompute(self.find(u))
+
+    def remove_edge(self, u: int, v: int):
+        u, v = int(u), int(v)
+        if not self.G.has_edge(u, v):
+            return
+        super().remove_edge(u, v)
+        racine = self.find(u)
+        membres = self.membres.pop(racine)
+        for node in membres:
+            self.parent[node] = node
+        self._relabel(membres)
+
+    def closeness(self):
+        """Closeness de tous les nœuds (mêmes valeurs que compute_all_closeness_classical)."""
+        n = self.G.number_of_nodes()
+        return {node: _closeness_from_sums(r, t, n) for node, (r, t) in self.sums.items()}
+
+
 def save_closeness_to_file(closeness_dict, filename):
     """
     Sauvegarde les valeurs de closeness dans un fichier
@@ -2,8 +2,10 @@ import os
 import random
 from pathlib import Path
 import networkx as nx
+import numpy as np
 
 from classical_closeness import compute_all_closeness_classical, save_closeness_to_file
+from actions_binaires import OPCODES, RECORD_DTYPE, ecrire_actions_binaires
 
 
 def project_paths():
@@ -22,6 +24,13 @@ def write_actions(lines: list[str], filepath: Path):
 			f.write(line.rstrip() + "\n")
 
 
+def write_actions_binary(records: list[tuple[int, int, int]], filepath: Path):
+	"""Écrit une liste de triplets (opcode, u, v) au format binaire compact."""
+	filepath.parent.mkdir(parents=True, exist_ok=True)
+	packed = np.array(records, dtype="<u4").reshape(-1, 3)
+	ecrire_actions_binaires(packed.view(RECORD_DTYPE).ravel(), filepath)
+
+
 def generate_social_graph(n_nodes: int = 1000, m: int = 3, seed: int | None = 42) -> nx.Graph:
 	"""Génère un graphe de type réseau social (scale-free) via Barabási–Albert.
 
@@ -130,7 +139,8 @@ def generate_dynamic_graph_with_probabilities(
 	p2: float,
 	p3: float,
 	p4: float,
-	seed: int | None = None
+	seed: int | None = None,
+	binaire: bool = False
 ) -> Path:
 	"""
 	À chaque itération, on choisit si on ajoute un nœud, supprime un nœud, 
@@ -146,6 +156,8 @@ def generate_dynamic_graph_with_probabilities(
 		p3: Probabilité d'insertion d'une arête
 		p4: Probabilité de suppression d'une arête
 		seed: Graine aléatoire
+		binaire: Si True, écrit directement le format binaire compact
+		         (voir actions_binaires) au lieu du texte, avec l'extension .icab
 	
 	Returns:
 		Path: Chemin vers le fichier généré
@@ -159,6 +171,8 @@ def generate_dynamic_graph_with_probabilities(
 	
 	_, data_dir = project_paths()
 	output_path = data_dir / nom
+	if binaire:
+		output_path = output_path.with_suffix(".icab")
 	
 	rnd = random.Random(seed)
 	
@@ -172,6 +186,16 @@ def generate_dynamic_graph_with_probabilities(
 	def nid(x):
 		return f"n{x}"
 	
+	# En mode binaire on accumule directement des triplets (opcode, u, v)
+	# pour éviter de produire puis reparser du texte
+	def emit(cmd, u, v=None):
+		if binaire:
+			actions.append((OPCODES[cmd], u, 0 if v is None else v))
+		elif v is None:
+			actions.append(f"{cmd} {nid(u)}")
+		else:
+			actions.append(f"{cmd} {nid(u)} {nid(v)}")
+	
 	# Générer exactement 'etapes' lignes
 	i = 0
 	while i < etapes:
@@ -183,7 +207,7 @@ def generate_dynamic_graph_with_probabilities(
 			new_id = next_id
 			next_id += 1
 			nodes.add(new_id)
-			actions.append(f"addNode {nid(new_id)}")
+			emit("addNode", new_id)
 			action_done = True
 		
 		elif p < p1 + p2:  # Supprimer un nœud
@@ -192,7 +216,7 @@ def generate_dynamic_graph_with_probabilities(
 				nodes.remove(x)
 				# Supprimer toutes ses arêtes incidentes
 				edges = {e for e in edges if x not in e}
-				actions.append(f"removeNode {nid(x)}")
+				emit("removeNode", x)
 				action_done = True
 			# Sinon on recommence cette itération (action_done reste False)
 		
@@ -203,7 +227,7 @@ def generate_dynamic_graph_with_probabilities(
 				e = tuple(sorted((u, v)))
 				if e not in edges:
 					edges.add(e)
-					actions.append(f"addEdge {nid(u)} {nid(v)}")
+					emit("addEdge", u, v)
 					action_done = True
 			# Sinon on recommence cette itération
 		
@@ -212,7 +236,7 @@ def generate_dynamic_graph_with_probabilities(
 				e = rnd.choice(list(edges))
 				edges.remove(e)
 				u, v = e
-				actions.append(f"removeEdge {nid(u)} {nid(v)}")
+				emit("removeEdge", u, v)
 				action_done = True
 			# Sinon on recommence cette itération
 		
@@ -221,7 +245,10 @@ def generate_dynamic_graph_with_probabilities(
 			i += 1
 	
 	# Écrire dans le fichier
-	write_actions(actions, output_path)
+	if binaire:
+		write_actions_binary(actions, output_path)
+	else:
+		write_actions(actions, output_path)
 	print(f"Graphe dynamique généré: {output_path}")
 	print(f"  - Lignes: {len(actions)} (doit être {etapes})")
 	print(f"  - Nœuds finaux: {len(nodes)}")
@@ -1,5 +1,24 @@
 import networkx as nx
 
+# Plus grand poids d'arête accepté : au-delà, les distances flottantes ne
+# sont plus des entiers exacts et leurs sommes (TotDist) peuvent déborder
+POIDS_MAXIMAL = 2 ** 53
+
+
+def verifier_poids(weight):
+    """
+    Lève ValueError si weight n'est pas un poids d'arête valide : les
+    plus courts chemins supposent des poids finis et positifs ou nuls (un
+    poids négatif peut créer un cycle absorbant). Un poids 0 est accepté :
+    IncrementalClosenessArticle désactive alors les raccourcis qui
+    supposent des poids strictement positifs (ponts, fusion).
+    """
+    # Faux aussi pour NaN
+    if not 0 <= weight <= POIDS_MAXIMAL:
+        raise ValueError(f"poids d'arête invalide: {weight} (attendu entre 0 et {POIDS_MAXIMAL})")
+    return weight
+
+
 class DynamicGraph:
     """Graphe dynamique basé sur NetworkX."""
 
@@ -19,10 +38,11 @@ class DynamicGraph:
             self.G.remove_node(node_id)
 
     def add_edge(self, u: int, v: int):
-        """Ajoute une arête u–v."""
+        """Ajoute une arête u–v de poids 1 (un ré-ajout remet le poids à 1)."""
         u, v = int(u), int(v)
         if u in self.G and v in self.G and u != v:
             self.G.add_edge(u, v)
+            self.G[u][v].pop('weight', None)
 
     def remove_edge(self, u: int, v: int):
         """Supprime une arête."""
@@ -30,6 +50,13 @@ class DynamicGraph:
         if self.G.has_edge(u, v):
             self.G.remove_edge(u, v)
 
+    def update_edge_weight(self, u: int, v: int, weight):
+        """Change le poids (attribut 'weight') d'une arête existante."""
+        u, v = int(u), int(v)
+        verifier_poids(weight)
+        if self.G.has_edge(u, v):
+            self.G[u][v]['weight'] = weight
+
     def get_nodes(self):
         return list(self.G.nodes())
 
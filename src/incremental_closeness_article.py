@@ -1,8 +1,31 @@
 import networkx as nx
+import numpy as np
 import math
-from collections import deque
+import logging
+import os
+import pickle
+from collections import deque, Counter
+from bisect import bisect_left, insort
 import heapq
 
+from classical_closeness import graph_to_csr, transpose_csr, bitset_bfs_levels, bits_par_source
+from graph import verifier_poids
+
+logger = logging.getLogger(__name__)
+
+# Coût d'une source dans une reconstruction complète, relativement à la mise
+# à jour incrémentale d'une source (mesuré : BFS bit-parallèle ~4x moins cher
+# par source que le BFS Python de DELETEUPDATESHRINKING)
+COUT_RELATIF_REBUILD = 0.25
+
+# Nombre de candidats évalués ensemble par evaluate_insertions (une matrice
+# dense candidats × n par bloc)
+TAILLE_BLOC_CANDIDATS = 256
+
+# Nombre de blocs de la closeness publiée : une publication ne recopie que
+# les blocs contenant des nœuds modifiés
+NB_BLOCS_PUBLICATION = 64
+
 
 class IncrementalClosenessArticle:
     """
@@ -20,34 +43,613 @@ class IncrementalClosenessArticle:
         self.W = {}  # W[x][y] = poids de l'arête x→y
         self.TotDist = {}  # TotDist[x] = somme des distances depuis x
         self.C = {}  # C[x] = closeness centrality de x
+        
+        # Agrégats globaux tenus à jour avec TotDist : somme des distances et
+        # nombre de paires ordonnées (s, t), s ≠ t, avec t atteignable depuis s
+        self.SommeDist = 0
+        self.NbPaires = 0
+        
+        # Bascule automatique vers une reconstruction complète quand le coût
+        # estimé des mises à jour incrémentales la dépasse
+        self.adaptive = True
+        self.cout_relatif_rebuild = COUT_RELATIF_REBUILD
+        self.compteurs_strategie = {"incremental": 0, "rebuild": 0}
+        
+        # Arcs x→y sans arc retour y→x de même poids : tant qu'il n'y en a
+        # pas, D est symétrique et la fusion de composantes s'applique
+        self._arcs_asymetriques = set()
+        # Arcs de poids 0 : avec eux, d(u,x) = d(v,x) est possible des deux
+        # côtés d'une arête u--v et les raccourcis par ponts ne s'appliquent pas
+        self._arcs_nuls = set()
+        # Vrai si tous les arcs ont un poids 1, None si inconnu (recalculé à la demande)
+        self._poids_unitaires = True
+        
+        # Index des ponts (arêtes non orientées dont la suppression coupe une
+        # composante), tenu à jour par les méthodes non orientées ; recalculé
+        # par nx.bridges quand _ponts_a_jour est faux
+        self.ponts = set()
+        self._ponts_a_jour = True
+        
+        # Mode différé : les modifications sont journalisées et appliquées
+        # en un seul lot à la prochaine requête de closeness
+        self.deferred = False
+        self._journal = []
+        self._vidage = False
+        
+        # Sources suivies : None = toutes ; sinon seules ces sources ont une
+        # ligne D, un TotDist et une closeness (mémoire O(|watch|·n))
+        self.watch = None
+        
+        # Mode local (set_radius) : None = distances complètes ; sinon seules
+        # les distances <= rayon sont stockées et propagées (closeness k-hop)
+        self.rayon = None
+        
+        # Index inverse optionnel (enable_reverse_index) : R[t][d] = ensemble
+        # des sources s telles que D[s][t] == d
+        self.R = None
+        
+        # Agrégats par colonne optionnels (enable_in_closeness) :
+        # TotDistIn[t] = Σ_s D[s][t] et NbIn[t] = nombre de sources atteignant t
+        self.TotDistIn = None
+        self.NbIn = None
+        
+        # Excentricités optionnelles (enable_eccentricity) : NbDist[s][d] =
+        # nombre de cibles à distance d de s, Ecc[s] = max des d, et
+        # SourcesParEcc[e] = sources d'excentricité e (valeurs triées dans
+        # _ecc_triees pour le rayon et le diamètre)
+        self.NbDist = None
+        self.Ecc = None
+        self.SourcesParEcc = None
+        self._ecc_triees = None
+        
+        # Betweenness optionnelle (enable_betweenness) : Sigma[s][t] = nombre
+        # de plus courts chemins de s à t, Dependance[s][t] = dépendance de s
+        # sur t (Brandes), BC[t] = Σ_s Dependance[s][t]. Les sources dont le
+        # DAG des plus courts chemins a changé sont recalculées à la requête
+        self.Sigma = None
+        self.Dependance = None
+        self.BC = None
+        self._sigma_sales = None
+        
+        # Transaction en cours (begin) : journal d'annulation des écritures
+        # dans D, C et G, rejoué à l'envers par rollback ; None hors transaction
+        self._annulation = None
+        
+        # Publication (enable_publication) : dernière VersionPubliee, lue sans
+        # verrou par les lecteurs, et nœuds dont C a changé depuis
+        self._version = None
+        self._publication_sales = None
     
-    def _initialize_all(self):
+    def initialize_from_graph(self, graph, algorithm=None):
         """
-        Calcule toutes les distances initiales par BFS depuis chaque nœud.
-        Utilisé lors de l'initialisation ou après des modifications complexes.
+        Charge un graphe NetworkX complet puis calcule toutes les distances
+        en bloc (au lieu d'insérer les arêtes une par une).
+
+        Un graphe non orienté donne deux arcs par arête ; le poids est lu dans
+        l'attribut 'weight' (1 par défaut).
+
+        Args:
+            graph: networkx.Graph ou DiGraph
+            algorithm: "bitset" (BFS bit-parallèle, poids unitaires) ou "bfs"
+                (BFS, Dijkstra si pondéré) ; None choisit "bitset" si tous
+                les poids valent 1, "bfs" sinon
         """
-        for source in self.G.nodes():
-            # BFS depuis source
-            distances = {source: 0}
+        self._hors_transaction("initialize_from_graph")
+        for _, _, c in graph.edges(data='weight', default=1):
+            verifier_poids(c)
+        self.G = nx.DiGraph()
+        if self._publication_sales is not None:
+            self._publication_sales.update(self.C)
+        self.D, self.W, self.TotDist, self.C = {}, {}, {}, {}
+        self.SommeDist, self.NbPaires = 0, 0
+        if self.R is not None:
+            self.R = {}
+        if self.TotDistIn is not None:
+            self.TotDistIn, self.NbIn = {}, {}
+        if self.Ecc is not None:
+            self._vider_ecc()
+        if self.Sigma is not None:
+            self.Sigma, self.Dependance, self.BC, self._sigma_sales = {}, {}, {}, set()
+        self._arcs_asymetriques = set()
+        self._arcs_nuls = set()
+        self._poids_unitaires = None
+        self._ponts_a_jour = False
+        
+        for node in graph.nodes():
+            self.G.add_node(node)
+            self.W[node] = {}
+        
+        for u, v, data in graph.edges(data=True):
+            c = data.get('weight', 1)
+            arcs = [(u, v)] if graph.is_directed() else [(u, v), (v, u)]
+            for a, b in arcs:
+                self.G.add_edge(a, b, weight=c)
+                self.W[a][b] = c
+                if c == 0:
+                    self._arcs_nuls.add((a, b))
+        
+        if graph.is_directed():
+            for u, v in graph.edges():
+                self._marquer_arc(u, v)
+        
+        if algorithm is None:
+            algorithm = "bitset" if self._all_unit_weights() else "bfs"
+        self._initialize_all(algorithm)
+    
+    def _marquer_arc(self, u, v):
+        """
+        Met à jour _arcs_asymetriques, _arcs_nuls et _poids_unitaires après
+        une modification (ajout, poids, suppression) de l'arc u→v.
+        """
+        c = self.W.get(u, {}).get(v)
+        if c == 0:
+            self._arcs_nuls.add((u, v))
+        else:
+            self._arcs_nuls.discard((u, v))
+        if c is not None and c != 1:
+            self._poids_unitaires = False
+        elif self._poids_unitaires is False:
+            # Un arc non unitaire a peut-être disparu
+            self._poids_unitaires = None
+        for a, b in ((u, v), (v, u)):
+            if b in self.W.get(a, {}) and self.W.get(b, {}).get(a) != self.W[a][b]:
+                self._arcs_asymetriques.add((a, b))
+                self._ponts_a_jour = False
+            else:
+                self._arcs_asymetriques.discard((a, b))
+    
+    def _all_unit_weights(self):
+        """Vrai si tous les arcs ont un poids 1 (distances = nombre de sauts)."""
+        if self._poids_unitaires is None:
+            self._poids_unitaires = all(c == 1 for succ in self.W.values() for c in succ.values())
+        return self._poids_unitaires
+    
+    def _distances_depuis(self, source):
+        """
+        Distances depuis source : BFS si tous les poids valent 1, Dijkstra
+        sinon (un BFS ne donne pas les plus courts chemins pondérés).
+        """
+        distances = {source: 0}
+        limite = self._limite()
+        if self._all_unit_weights():
             queue = deque([source])
-            
             while queue:
                 u = queue.popleft()
+                if distances[u] + 1 > limite:
+                    continue
                 for v in self.G.successors(u):
                     if v not in distances:
-                        distances[v] = distances[u] + self.W[u][v]
+                        distances[v] = distances[u] + 1
                         queue.append(v)
+            return distances
+        
+        tas = [(0, source)]
+        fixes = set()
+        while tas:
+            d, u = heapq.heappop(tas)
+            if u in fixes:
+                continue
+            fixes.add(u)
+            for v in self.G.successors(u):
+                nd = d + self.W[u][v]
+                if nd < distances.get(v, math.inf) and nd <= limite:
+                    distances[v] = nd
+                    heapq.heappush(tas, (nd, v))
+        return distances
+    
+    def _initialize_all(self, algorithm="bfs"):
+        """
+        Calcule toutes les distances initiales par BFS depuis chaque nœud.
+        Utilisé lors de l'initialisation ou après des modifications complexes.
+        
+        algorithm="bitset" utilise le BFS bit-parallèle de classical_closeness
+        (64 sources par passe), valable uniquement pour des poids unitaires.
+        """
+        if algorithm == "bitset":
+            if not self._all_unit_weights():
+                raise ValueError("L'initialisation bit-parallèle suppose des poids unitaires")
+            self._initialize_bitset()
+            return
+        
+        for source in self._sources():
+            # BFS (Dijkstra si poids non unitaires) depuis source
+            distances = self._distances_depuis(source)
+            
+            self._set_row(source, distances)
+            self._update_closeness(source)
+    
+    def _initialize_bitset(self):
+        """
+        Remplit D, TotDist et C par BFS bit-parallèle : pour chaque lot de
+        64 sources, les nœuds découverts au niveau l sont ajoutés en bloc
+        (dict.fromkeys) aux lignes D des sources concernées.
+        """
+        nodes, indptr, indices = graph_to_csr(self.G)
+        predecessors = transpose_csr(indptr, indices)
+        noeuds = np.empty(len(nodes), dtype=object)
+        noeuds[:] = nodes
+        positions = np.array([i for i, x in enumerate(nodes) if self._suivi(x)], dtype=np.int64)
+        
+        for debut in range(0, len(positions), 64):
+            sources = positions[debut:debut + 64]
+            lignes = [{} for _ in sources]
+            
+            for level, nouveaux in bitset_bfs_levels(indptr, indices, sources, predecessors):
+                if level > self._limite():
+                    break
+                actifs = np.flatnonzero(nouveaux)
+                # Paires (source k, nœud v) triées par source
+                k, v = np.nonzero(bits_par_source(nouveaux[actifs], len(sources)).T)
+                bornes = np.searchsorted(k, np.arange(len(sources) + 1))
+                atteints = noeuds[actifs[v]].tolist()
+                for j, ligne in enumerate(lignes):
+                    ligne.update(dict.fromkeys(atteints[bornes[j]:bornes[j + 1]], level))
             
-            self.D[source] = distances
-            self.TotDist[source] = sum(distances.values())
+            for j, i in enumerate(sources.tolist()):
+                self._set_row(nodes[i], lignes[j])
+        
+        for source in noeuds[positions].tolist():
             self._update_closeness(source)
     
+    # ==========================================================================
+    # Écritures dans D : TotDist, les agrégats globaux, l'index inverse R et
+    # les agrégats par colonne sont tenus à jour ici
+    # ==========================================================================
+    def _set_dist(self, s, t, d):
+        """D[s][t] = d."""
+        if self.Sigma is not None:
+            self._sigma_sales.add(s)
+        ligne = self.D[s]
+        ancien = ligne.get(t)
+        if self._annulation is not None:
+            self._annulation.append(("dist", s, t, ancien))
+        if ancien is not None:
+            self.TotDist[s] -= ancien
+            self.SommeDist -= ancien
+            if self.R is not None:
+                self._retirer_inverse(s, t, ancien)
+            if self.TotDistIn is not None:
+                self.TotDistIn[t] -= ancien
+            if self.Ecc is not None:
+                self._nb_dist(s, ancien, -1)
+        elif self.TotDistIn is not None:
+            self.NbIn[t] = self.NbIn.get(t, 0) + 1
+            self.TotDistIn.setdefault(t, 0)
+        if ancien is None:
+            self.NbPaires += 1
+        ligne[t] = d
+        self.TotDist[s] += d
+        self.SommeDist += d
+        if self.R is not None:
+            self.R.setdefault(t, {}).setdefault(d, set()).add(s)
+        if self.TotDistIn is not None:
+            self.TotDistIn[t] += d
+        if self.Ecc is not None:
+            self._nb_dist(s, d, 1)
+    
+    def _del_dist(self, s, t):
+        """Supprime D[s][t] (t devient inatteignable depuis s)."""
+        if self.Sigma is not None:
+            self._sigma_sales.add(s)
+        ancien = self.D[s].pop(t)
+        if self._annulation is not None:
+            self._annulation.append(("dist", s, t, ancien))
+        self.TotDist[s] -= ancien
+        self.SommeDist -= ancien
+        self.NbPaires -= 1
+        if self.R is not None:
+            self._retirer_inverse(s, t, ancien)
+        if self.TotDistIn is not None:
+            self._retirer_colonne(t, ancien)
+        if self.Ecc is not None:
+            self._nb_dist(s, ancien, -1)
+    
+    def _set_row(self, s, ligne):
+        """Remplace toute la ligne D[s]."""
+        if self.Sigma is not None:
+            self._sigma_sales.add(s)
+        if self._annulation is not None:
+            self._annulation.append(("ligne", s, self.D.get(s)))
+        if self.R is not None:
+            for t, d in self.D.get(s, {}).items():
+                self._retirer_inverse(s, t, d)
+            for t, d in ligne.items():
+                self.R.setdefault(t, {}).setdefault(d, set()).add(s)
+        if self.TotDistIn is not None:
+            for t, d in self.D.get(s, {}).items():
+                self._retirer_colonne(t, d)
+            for t, d in ligne.items():
+                self.NbIn[t] = self.NbIn.get(t, 0) + 1
+                self.TotDistIn[t] = self.TotDistIn.get(t, 0) + d
+        if s in self.D:
+            self.SommeDist -= self.TotDist[s]
+            self.NbPaires -= len(self.D[s]) - 1
+        self.D[s] = ligne
+        self.TotDist[s] = sum(ligne.values())
+        self.SommeDist += self.TotDist[s]
+        self.NbPaires += len(ligne) - 1
+        if self.Ecc is not None:
+            self.NbDist[s] = Counter(ligne.values())
+            self._placer_ecc(s, max(self.NbDist[s]))
+    
+    def _del_row(self, s):
+        """Supprime la ligne D[s] (s n'est plus une source maintenue)."""
+        if self.Sigma is not None:
+            self._sigma_sales.add(s)
+        ligne = self.D.pop(s, None)
+        if ligne is not None and self._annulation is not None:
+            self._annulation.append(("ligne", s, ligne))
+        if ligne is not None:
+            self.SommeDist -= self.TotDist.pop(s)
+            self.NbPaires -= len(ligne) - 1
+        if self.R is not None and ligne:
+            for t, d in ligne.items():
+                self._retirer_inverse(s, t, d)
+        if self.TotDistIn is not None and ligne:
+            for t, d in ligne.items():
+                self._retirer_colonne(t, d)
+        if self.Ecc is not None:
+            self.NbDist.pop(s, None)
+            self._placer_ecc(s, None)
+    
+    def _retirer_inverse(self, s, t, d):
+        seaux = self.R[t]
+        seau = seaux[d]
+        seau.discard(s)
+        if not seau:
+            del seaux[d]
+            if not seaux:
+                del self.R[t]
+    
+    def _retirer_colonne(self, t, d):
+        self.TotDistIn[t] -= d
+        self.NbIn[t] -= 1
+        if not self.NbIn[t]:
+            del self.NbIn[t]
+            del self.TotDistIn[t]
+    
+    def _colonnes_symetriques(self, noeuds):
+        """
+        Graphe symétrique : la colonne de x est sa ligne, les agrégats par
+        colonne se recopient depuis TotDist (fusion et scission de composantes).
+        """
+        if self.TotDistIn is not None:
+            for x in noeuds:
+                self.TotDistIn[x] = self.TotDist[x]
+                self.NbIn[x] = len(self.D[x])
+    
+    def _nb_dist(self, s, d, delta):
+        """Ajoute delta au nombre de cibles à distance d de s et ajuste Ecc[s]."""
+        compte = self.NbDist[s]
+        nb = compte.get(d, 0) + delta
+        if nb:
+            compte[d] = nb
+            if d > self.Ecc[s]:
+                self._placer_ecc(s, d)
+        else:
+            del compte[d]
+            if d == self.Ecc[s]:
+                self._placer_ecc(s, max(compte) if compte else None)
+    
+    def _ajouter_comptes(self, s, comptes, signe=1):
+        """Ajoute (signe=1) ou retire (signe=-1) un Counter de distances à NbDist[s]."""
+        compte = self.NbDist[s]
+        for d, nb in comptes.items():
+            total = compte.get(d, 0) + signe * nb
+            if total:
+                compte[d] = total
+            else:
+                del compte[d]
+        self._placer_ecc(s, max(compte) if compte else None)
+    
+    def _placer_ecc(self, s, e):
+        """Déplace s dans le seau d'excentricité e (None : s n'est plus une source)."""
+        ancien = self.Ecc.get(s)
+        if ancien == e:
+            return
+        if ancien is not None:
+            seau = self.SourcesParEcc[ancien]
+            seau.discard(s)
+            if not seau:
+                del self.SourcesParEcc[ancien]
+                del self._ecc_triees[bisect_left(self._ecc_triees, ancien)]
+        if e is None:
+            del self.Ecc[s]
+            return
+        self.Ecc[s] = e
+        if e not in self.SourcesParEcc:
+            self.SourcesParEcc[e] = set()
+            insort(self._ecc_triees, e)
+        self.SourcesParEcc[e].add(s)
+    
+    def _vider_ecc(self):
+        self.NbDist, self.Ecc, self.SourcesParEcc, self._ecc_triees = {}, {}, {}, []
+    
+    def enable_eccentricity(self):
+        """
+        Active le suivi des excentricités : pour chaque source, le nombre de
+        cibles par distance est tenu à jour par les écritures dans D, ce qui
+        permet de baisser Ecc[s] quand la distance maximale disparaît. Rayon,
+        diamètre et centre se lisent alors dans les seaux d'excentricité.
+        """
+        self._vider_ecc()
+        for s, ligne in self.D.items():
+            self.NbDist[s] = Counter(ligne.values())
+            self._placer_ecc(s, max(self.NbDist[s]))
+    
+    def disable_eccentricity(self):
+        """Désactive et libère le suivi des excentricités."""
+        self.NbDist = self.Ecc = self.SourcesParEcc = self._ecc_triees = None
+    
+    def enable_in_closeness(self):
+        """
+        Active les agrégats par colonne de D (distances VERS chaque nœud),
+        tenus à jour par les mêmes passes que les lignes : la closeness
+        entrante est alors disponible sans transposer le graphe.
+        """
+        self.TotDistIn, self.NbIn = {}, {}
+        for ligne in self.D.values():
+            for t, d in ligne.items():
+                self.NbIn[t] = self.NbIn.get(t, 0) + 1
+                self.TotDistIn[t] = self.TotDistIn.get(t, 0) + d
+    
+    def disable_in_closeness(self):
+        """Désactive et libère les agrégats par colonne."""
+        self.TotDistIn = self.NbIn = None
+    
+    def enable_reverse_index(self):
+        """
+        Active l'index inverse R[t][d] (sources à distance d de t), construit
+        depuis D. Les sources affectées par une mise à jour sont alors
+        énumérées par seaux de distances au lieu de lire toutes les lignes D.
+        
+        Chaque écriture dans D met aussi R à jour : l'index est rentable
+        quand peu de sources atteignent les extrémités des arcs modifiés
+        (mode local set_radius, graphes orientés peu connexes) ; avec des
+        distances complètes sur un graphe connexe, il ralentit les
+        insertions d'environ 20 à 30 %.
+        """
+        self.R = {}
+        for s, ligne in self.D.items():
+            for t, d in ligne.items():
+                self.R.setdefault(t, {}).setdefault(d, set()).add(s)
+    
+    def disable_reverse_index(self):
+        """Désactive et libère l'index inverse."""
+        self.R = None
+    
+    def _sources_atteignant(self, t):
+        """Sources maintenues depuis lesquelles t est atteignable (t compris)."""
+        if self.R is not None:
+            return [s for seau in self.R.get(t, {}).values() for s in seau]
+        return [s for s, ligne in self.D.items() if t in ligne]
+    
+    def _limite(self):
+        """Plus grande distance stockée dans D (infinie hors mode local)."""
+        return math.inf if self.rayon is None else self.rayon
+    
+    def _raccourcis_symetriques(self):
+        """
+        Vrai si les raccourcis arithmétiques (fusion de composantes, ponts)
+        s'appliquent : graphe symétrique sans arc de poids 0 (les côtés d'un
+        pont se distinguent par d(u,x) < d(v,x)), lignes D complètes pour
+        toutes les sources, et hors transaction (ils écrivent D en bloc,
+        sans passer par le journal d'annulation).
+        """
+        return (not self._arcs_asymetriques and not self._arcs_nuls and self.watch is None
+                and self.rayon is None and self._annulation is None)
+    
+    def set_radius(self, k):
+        """
+        Passe en mode local : seules les distances <= k sont stockées, et
+        les propagations d'insertion et de réparation après suppression
+        s'arrêtent au-delà de k. La closeness devient la closeness k-hop
+        (nœuds à distance <= k) ; mémoire et mises à jour suivent la taille
+        des voisinages au lieu de n². k=None revient aux distances complètes.
+        
+        Les requêtes globales (agrégats, excentricités, betweenness,
+        closeness entrante) lèvent ValueError en mode local.
+        """
+        self._hors_transaction("set_radius")
+        self.flush()
+        self.rayon = k
+        self._ponts_a_jour = False
+        self._rebuild()
+    
+    def _sources(self):
+        """Sources dont les distances sont maintenues (toutes, ou les nœuds suivis)."""
+        if self.watch is None:
+            return self.G.nodes()
+        return [s for s in self.watch if s in self.G]
+    
+    def _suivi(self, node):
+        """Vrai si les distances depuis node sont maintenues."""
+        return self.watch is None or node in self.watch
+    
+    def _rebuild(self):
+        """
+        Recalcule D, TotDist et C en bloc depuis le graphe courant
+        (BFS bit-parallèle si tous les poids sont unitaires).
+        """
+        if self._annulation is not None:
+            # Transaction : les anciennes lignes passent par le journal
+            for s in list(self.D):
+                self._del_row(s)
+            for x in list(self.C):
+                self._retirer_closeness(x)
+            self._initialize_all("bitset" if self._all_unit_weights() else "bfs")
+            return
+        if self._publication_sales is not None:
+            self._publication_sales.update(self.C)
+        self.D, self.TotDist, self.C = {}, {}, {}
+        self.SommeDist, self.NbPaires = 0, 0
+        if self.R is not None:
+            self.R = {}
+        if self.TotDistIn is not None:
+            self.TotDistIn, self.NbIn = {}, {}
+        if self.Ecc is not None:
+            self._vider_ecc()
+        if self.Sigma is not None:
+            self.Sigma, self.Dependance, self.BC, self._sigma_sales = {}, {}, {}, set()
+        self._initialize_all("bitset" if self._all_unit_weights() else "bfs")
+    
+    def _cout_incremental(self, operation, v, nb_sources):
+        """Coût estimé de la mise à jour de nb_sources sources pour un arc ?→v."""
+        n = len(self.G)
+        m = self.G.number_of_edges()
+        if operation == "insert":
+            # Sans ligne pour v (nœud non suivi), on borne par n
+            atteints = len(self.D[v]) if v in self.D else n
+            return nb_sources * atteints * (1 + m / max(n, 1))
+        return nb_sources * (n + m)
+    
+    def _cout_rebuild(self, cout_incremental):
+        """
+        Coût estimé d'une reconstruction complète. Le parcours des poids
+        n'est fait que si la reconstruction bit-parallèle peut gagner. Avec
+        l'index inverse, chaque distance recalculée est réinsérée une à une
+        dans R : la reconstruction n'est alors pas moins chère par nœud
+        visité que les mises à jour incrémentales.
+        """
+        n = len(self.G)
+        cout_rebuild = len(self._sources()) * (n + self.G.number_of_edges())
+        if (self.R is None and cout_rebuild * self.cout_relatif_rebuild < cout_incremental
+                and self._all_unit_weights()):
+            cout_rebuild *= self.cout_relatif_rebuild
+        return cout_rebuild
+    
+    def _choisir_rebuild(self, operation, u, v, AffectedSources):
+        """
+        Estime le coût des mises à jour incrémentales pour AffectedSources et
+        celui d'une reconstruction complète, et renvoie True si la
+        reconstruction est moins chère.
+        
+        Unité : visites de (nœud + arcs sortants). Une suppression refait un
+        BFS complet par source affectée ; une insertion propage au plus vers
+        les nœuds atteignables depuis v.
+        """
+        if not self.adaptive or not AffectedSources:
+            return False
+        
+        cout_incremental = self._cout_incremental(operation, v, len(AffectedSources))
+        cout_rebuild = self._cout_rebuild(cout_incremental)
+        rebuild = cout_rebuild < cout_incremental
+        self.compteurs_strategie["rebuild" if rebuild else "incremental"] += 1
+        logger.debug("%s %s->%s: %d sources affectées, coût incrémental %.0f, "
+                     "coût reconstruction %.0f -> %s", operation, u, v, len(AffectedSources),
+                     cout_incremental, cout_rebuild, "reconstruction" if rebuild else "incrémental")
+        return rebuild
+    
     def _update_closeness(self, node):
         """
         Calcule la closeness centrality normalisée pour un nœud.
         Formule NetworkX : C(x) = (reachable / TotDist) * (reachable / (n-1))
         où reachable = nombre de nœuds atteignables AUTRES que x
         """
+        if self._annulation is not None:
+            self._annulation.append(("C", node, self.C.get(node)))
+        if self._publication_sales is not None:
+            self._publication_sales.add(node)
         n = len(self.G)
         if n <= 1:
             self.C[node] = 0.0
@@ -67,6 +669,15 @@ class IncrementalClosenessArticle:
             # Normalisation identique à NetworkX
             self.C[node] = (reachable / totdist) * (reachable / (n - 1))
     
+    def _retirer_closeness(self, node):
+        """Supprime C[node] (node n'est plus une source maintenue)."""
+        if node in self.C:
+            if self._annulation is not None:
+                self._annulation.append(("C", node, self.C[node]))
+            if self._publication_sales is not None:
+                self._publication_sales.add(node)
+            del self.C[node]
+    
     def _SP(self, x, y, z):
         """
         Prédicat SP(x,y,z) de l'article : retourne True si l'arête x→y
@@ -104,34 +715,54 @@ class IncrementalClosenessArticle:
         7. for all s ∈ AffectedSources do
         8.     INSERTUPDATEGROWING(u, v, s, c)
         9. end for
+        
+        Lève ValueError pour un coût négatif, infini ou NaN (verifier_poids).
         """
+        verifier_poids(c)
+        if self._differer("insert", u, v, c):
+            return
+        
         # Ligne 1: Insérer l'arête u→v avec coût c
+        n = len(self.G)
         if not self.G.has_edge(u, v):
             self.G.add_edge(u, v, weight=c)
             if u not in self.W:
                 self.W[u] = {}
             self.W[u][v] = c
+        elif c > self.W[u][v]:
+            # Une hausse de poids allonge des chemins : ce n'est pas une insertion
+            self.update_edge_weight(u, v, c)
+            return
         else:
             # Mettre à jour le poids
             self.W[u][v] = c
             self.G[u][v]['weight'] = c
+        self._marquer_arc(u, v)
         
         # Lignes 2-6: Déterminer AffectedSources
-        AffectedSources = []
-        for s in self.G.nodes():
+        for s in self._sources():
             if s not in self.D:
-                self.D[s] = {}
-            
-            d_su = self.D[s].get(u, math.inf)
-            d_sv = self.D[s].get(v, math.inf)
-            
-            # Ligne 3: Si le nouveau chemin s→u→v est plus court
-            if d_su + c < d_sv:
-                AffectedSources.append(s)
+                # Nœud créé implicitement par l'arc
+                self._set_row(s, {s: 0})
+        if self.Sigma is not None:
+            # d(s,u) + c = d(s,v) : distances inchangées mais nouveaux plus courts chemins
+            self._sigma_sales.update(self._sources_sur_arc(u, v, c))
+        AffectedSources = self._sources_raccourcies(u, v, c)
+        
+        # Trop de sources affectées : une reconstruction en bloc coûte moins cher
+        if self._choisir_rebuild("insert", u, v, AffectedSources):
+            self._rebuild()
+            return
         
         # Lignes 7-9: Mettre à jour chaque source affectée
         for s in AffectedSources:
             self.INSERTUPDATEGROWING(u, v, s, c)
+        
+        # L'arc a créé u ou v : n a changé, comme dans add_node toutes les
+        # closeness sont renormalisées
+        if len(self.G) != n:
+            for s in self._sources():
+                self._update_closeness(s)
     
     # ==========================================================================
     # Algorithm 2: INSERTUPDATEGROWING(u, v, z, c)
@@ -153,7 +784,9 @@ class IncrementalClosenessArticle:
         Donc il faut inverser : on propage les distances DEPUIS z !
         """
         # Lignes 1-2: Initialiser workset et visited
-        # On traite les paires (nœud mis à jour, son prédécesseur qui a causé la mise à jour)
+        # visited = nœuds actuellement dans le workset : un nœud dont la
+        # distance diminue encore après son traitement y est remis (poids
+        # non unitaires) ; avec des poids 1, la première mise à jour est finale
         workset = deque([v])
         visited = set([v])
         
@@ -163,15 +796,14 @@ class IncrementalClosenessArticle:
         new_dist_v = d_zu + w_uv
         old_dist_v = self.D[z].get(v, math.inf)
         
-        if new_dist_v < old_dist_v:
-            if old_dist_v != math.inf:
-                self.TotDist[z] -= old_dist_v
-            self.D[z][v] = new_dist_v
-            self.TotDist[z] += new_dist_v
+        limite = self._limite()
+        if new_dist_v < old_dist_v and new_dist_v <= limite:
+            self._set_dist(z, v, new_dist_v)
         
         # Ligne 3: Propager depuis v
         while workset:
             y = workset.popleft()
+            visited.discard(y)
             
             # Pour chaque successeur w de y
             for w in self.G.successors(y):
@@ -181,15 +813,12 @@ class IncrementalClosenessArticle:
                 new_dist = d_zy + w_yw
                 old_dist = self.D[z].get(w, math.inf)
                 
-                if new_dist < old_dist:
+                # Au-delà du rayon (mode local), rien n'est stocké ni propagé
+                if new_dist < old_dist and new_dist <= limite:
                     # Mettre à jour distance et TotDist
-                    if old_dist != math.inf:
-                        self.TotDist[z] -= old_dist
-                    
-                    self.D[z][w] = new_dist
-                    self.TotDist[z] += new_dist
+                    self._set_dist(z, w, new_dist)
                     
-                    # Ajouter w au workset s'il n'a pas été visité
+                    # Ajouter w au workset s'il n'y est pas déjà
                     if w not in visited:
                         workset.append(w)
                         visited.add(w)
@@ -215,31 +844,90 @@ class IncrementalClosenessArticle:
         8.     DELETEUPDATESHRINKING(u, v, s, c)
         9. end for
         """
+        if self._differer("delete", u, v, c):
+            return
         if not self.G.has_edge(u, v):
             return
+        # Le poids réel de l'arc fait foi (c peut venir d'un appelant qui l'ignore)
+        c = self.W[u][v]
         
         # Ligne 1: Supprimer l'arête u→v
         self.G.remove_edge(u, v)
         if u in self.W and v in self.W[u]:
             del self.W[u][v]
+        self._marquer_arc(u, v)
         
         # Lignes 2-6: Déterminer AffectedSources
+        AffectedSources = self._sources_sur_arc(u, v, c)
+        if self.Sigma is not None:
+            # Même si d(s,v) ne change pas, les chemins via u→v disparaissent
+            self._sigma_sales.update(AffectedSources)
+        
+        if self._choisir_rebuild("delete", u, v, AffectedSources):
+            self._rebuild()
+            return
+        
+        # Lignes 7-9: Mettre à jour chaque source affectée
+        for s in AffectedSources:
+            self.DELETEUPDATESHRINKING(u, v, s, c)
+    
+    def _sources_raccourcies(self, u, v, c):
+        """
+        Sources s pour lesquelles l'arc u→v de coût c raccourcit le chemin
+        vers v : d(s,u) + c < d(s,v) (ligne 3 de l'algorithme 1).
+        
+        Avec l'index inverse : seules les sources qui atteignent u (seaux
+        R[u][d]) peuvent être raccourcies ; chacune est testée sur sa ligne
+        D[s][v], sans parcourir les sources qui atteignent v.
+        """
+        if self.R is not None:
+            limite = self._limite()
+            AffectedSources = []
+            for d, seau in self.R.get(u, {}).items():
+                if d + c <= limite:
+                    AffectedSources.extend(s for s in seau if d + c < self.D[s].get(v, math.inf))
+            return AffectedSources
+        
+        AffectedSources = []
+        for s in self._sources():
+            d_su = self.D[s].get(u, math.inf)
+            d_sv = self.D[s].get(v, math.inf)
+            
+            # Si le nouveau chemin s→u→v est plus court (et dans le rayon)
+            if d_su + c < d_sv and d_su + c <= self._limite():
+                AffectedSources.append(s)
+        return AffectedSources
+    
+    def _sources_sur_arc(self, u, v, c):
+        """
+        Sources s pour lesquelles l'arc u→v de coût c est sur un plus court
+        chemin vers v : d(s,u) + c = d(s,v) (ligne 3 de l'algorithme 3).
+        
+        Avec l'index inverse : intersection des seaux R[u][d] et R[v][d + c].
+        """
+        if self.R is not None:
+            Ru, Rv = self.R.get(u, {}), self.R.get(v, {})
+            cles_v = sorted(Rv)
+            AffectedSources = []
+            for d, seau in Ru.items():
+                i = bisect_left(cles_v, d + c - 1e-9)
+                while i < len(cles_v) and cles_v[i] <= d + c + 1e-9:
+                    AffectedSources.extend(seau & Rv[cles_v[i]])
+                    i += 1
+            return AffectedSources
+        
         AffectedSources = []
-        for s in self.G.nodes():
+        for s in self._sources():
             if s not in self.D:
                 continue
             
             d_su = self.D[s].get(u, math.inf)
             d_sv = self.D[s].get(v, math.inf)
             
-            # Ligne 3: Si l'arête supprimée était sur un plus court chemin
             if d_su != math.inf and d_sv != math.inf:
                 if abs(d_su + c - d_sv) < 1e-9:
                     AffectedSources.append(s)
-        
-        # Lignes 7-9: Mettre à jour chaque source affectée
-        for s in AffectedSources:
-            self.DELETEUPDATESHRINKING(u, v, s, c)
+        return AffectedSources
     
     # ==========================================================================
     # Algorithm 4: DELETEUPDATESHRINKING(u, v, z, c)
@@ -251,46 +939,103 @@ class IncrementalClosenessArticle:
         Version simplifiée mais correcte : recalculer toutes les distances depuis z.
         L'implémentation complète de l'article est très complexe et sujette aux bugs.
         """
-        # Recalculer toutes les distances depuis z via BFS
-        distances = {z: 0}
-        queue = deque([z])
-        
-        while queue:
-            current = queue.popleft()
-            for successor in self.G.successors(current):
-                if successor not in distances:
-                    distances[successor] = distances[current] + self.W[current][successor]
-                    queue.append(successor)
+        # Recalculer toutes les distances depuis z (BFS, ou Dijkstra si pondéré)
+        distances = self._distances_depuis(z)
         
         # Mettre à jour D[z] et TotDist[z]
-        old_totdist = self.TotDist.get(z, 0)
-        self.D[z] = distances
-        self.TotDist[z] = sum(distances.values())
+        self._set_row(z, distances)
         
         # Mettre à jour closeness
         self._update_closeness(z)
     
+    # ==========================================================================
+    # Modification du poids d'une arête
+    # ==========================================================================
+    def update_edge_weight(self, u, v, c):
+        """
+        Change le poids de l'arc existant u→v en c.
+        
+        Une baisse ne peut que raccourcir des chemins : elle passe par
+        l'insertion (INSERTEDGEGROWING, sources telles que d(s,u) + c < d(s,v)).
+        Une hausse ne peut que les allonger, et seulement pour les sources
+        dont un plus court chemin empruntait u→v avec l'ancien poids : elles
+        sont recalculées comme après une suppression, sans retirer l'arc.
+        """
+        verifier_poids(c)
+        if self._differer("update", u, v, c):
+            return
+        if not self.G.has_edge(u, v):
+            return
+        ancien = self.W[u][v]
+        if c == ancien:
+            return
+        if c < ancien:
+            self.INSERTEDGEGROWING(u, v, c)
+            return
+        
+        AffectedSources = self._sources_sur_arc(u, v, ancien)
+        if self.Sigma is not None:
+            self._sigma_sales.update(AffectedSources)
+        self.W[u][v] = c
+        self.G[u][v]['weight'] = c
+        self._marquer_arc(u, v)
+        
+        if self._choisir_rebuild("delete", u, v, AffectedSources):
+            self._rebuild()
+            return
+        
+        for s in AffectedSources:
+            self.DELETEUPDATESHRINKING(u, v, s, ancien)
+    
     # ==========================================================================
     # Méthodes pour gérer les nœuds
     # ==========================================================================
     def add_node(self, node):
         """Ajoute un nœud isolé au graphe."""
+        if self._differer("add_node", node):
+            return
         if not self.G.has_node(node):
             self.G.add_node(node)
-            self.D[node] = {node: 0}
-            self.TotDist[node] = 0
+            if self._suivi(node):
+                self._set_row(node, {node: 0})
             self.W[node] = {}
             
             # IMPORTANT: Quand n change, la closeness de TOUS les nœuds doit être recalculée
             # car la formule contient (reachable / (n-1)) où n = nombre total de nœuds
-            for s in self.G.nodes():
+            for s in self._sources():
                 self._update_closeness(s)
     
     def remove_node(self, node):
         """Supprime un nœud et toutes ses arêtes incidentes."""
+        if self._differer("remove_node", node):
+            return
         if not self.G.has_node(node):
             return
         
+        # Graphe symétrique : les arêtes incidentes qui sont des ponts sont
+        # coupées arithmétiquement, sans BFS
+        if self._raccourcis_symetriques():
+            for w in list(self.G.successors(node)):
+                if w != node and self._est_pont(node, w):
+                    self._scission_pont(node, w)
+        
+        # Sources dont les plus courts chemins peuvent passer par node : si
+        # elles sont trop nombreuses (hub), une seule reconstruction remplace
+        # les suppressions arc par arc
+        if self.G.out_degree(node) or self.G.in_degree(node):
+            AffectedSources = [s for s in self._sources_atteignant(node) if s != node]
+            if self._choisir_rebuild("remove_node", node, node, AffectedSources):
+                self.G.remove_node(node)
+                self.W.pop(node, None)
+                for succ in self.W.values():
+                    succ.pop(node, None)
+                self._arcs_asymetriques = {arc for arc in self._arcs_asymetriques if node not in arc}
+                self._arcs_nuls = {arc for arc in self._arcs_nuls if node not in arc}
+                self._poids_unitaires = None
+                self._ponts_a_jour = False
+                self._rebuild()
+                return
+        
         # Supprimer toutes les arêtes incidentes
         edges_to_remove = []
         for u, v in self.G.in_edges(node):
@@ -303,26 +1048,18 @@ class IncrementalClosenessArticle:
         
         # Supprimer le nœud
         self.G.remove_node(node)
-        if node in self.D:
-            del self.D[node]
-        if node in self.TotDist:
-            del self.TotDist[node]
-        if node in self.C:
-            del self.C[node]
+        self._del_row(node)
+        self._retirer_closeness(node)
         if node in self.W:
             del self.W[node]
         
         # Nettoyer les références dans les autres structures
-        for s in list(self.D.keys()):
-            if node in self.D[s]:
-                # Soustraire l'ancienne distance de TotDist
-                old_dist = self.D[s][node]
-                if old_dist != 0:  # Ne pas soustraire la distance à soi-même
-                    self.TotDist[s] -= old_dist
-                del self.D[s][node]
+        for s in self._sources_atteignant(node):
+            # Soustrait aussi l'ancienne distance de TotDist
+            self._del_dist(s, node)
         
         # Recalculer les closeness de tous les nœuds (le nombre de nœuds a changé)
-        for s in self.G.nodes():
+        for s in self._sources():
             self._update_closeness(s)
     
     # ==========================================================================
@@ -332,22 +1069,882 @@ class IncrementalClosenessArticle:
         """
         Ajoute une arête non orientée u--v en créant deux arêtes orientées :
         u→v et v→u, toutes deux de poids weight.
+        
+        Si l'arête relie deux composantes distinctes d'un graphe symétrique,
+        les nouvelles distances sont remplies en bloc (_fusion_composantes).
         """
+        verifier_poids(weight)
+        if self._differer("add_undirected", u, v, weight):
+            return
+        # La fusion et l'index des ponts lisent les lignes D de u et v et
+        # écrivent celles de toutes les sources : réservés au suivi complet
+        symetrique = self._raccourcis_symetriques()
+        if u != v and u in self.D and v in self.D and v not in self.D[u] and symetrique:
+            self._fusion_composantes(u, v, weight)
+            # La seule arête entre les deux composantes est un pont
+            self.ponts.add(frozenset((u, v)))
+            return
+        
+        # Index des ponts après l'insertion : les ponts séparant u et v ne le
+        # sont plus (calculé avec les distances d'avant l'insertion)
+        ponts_a_jour = self._ponts_a_jour and symetrique and u in self.D and v in self.D
+        if ponts_a_jour and u != v and not self.G.has_edge(u, v):
+            self.ponts = {p for p in self.ponts if not self._pont_separe(p, u, v)}
+        
         self.INSERTEDGEGROWING(u, v, weight)
         self.INSERTEDGEGROWING(v, u, weight)
+        self._ponts_a_jour = ponts_a_jour
+    
+    def _pont_separe(self, pont, u, v):
+        """
+        Vrai si le pont sépare u et v. Pour un pont a--b, u est du côté de a
+        si et seulement si d(u,a) < d(u,b).
+        """
+        a, b = pont
+        Du, Dv = self.D[u], self.D[v]
+        if a not in Du and a not in Dv:
+            return False
+        return (Du.get(a, math.inf) < Du.get(b, math.inf)) != (Dv.get(a, math.inf) < Dv.get(b, math.inf))
+    
+    def _est_pont(self, u, v):
+        """Vrai si l'arête non orientée u--v est un pont (index recalculé si besoin)."""
+        if not self._ponts_a_jour:
+            self.ponts = {frozenset(e) for e in nx.bridges(self.G.to_undirected(as_view=True))}
+            self._ponts_a_jour = True
+        return frozenset((u, v)) in self.ponts
+    
+    def update_undirected_edge_weight(self, u, v, weight):
+        """
+        Change le poids de l'arête non orientée u--v (arcs u→v et v→u).
+        Un changement de poids ne crée ni ne supprime de pont.
+        """
+        verifier_poids(weight)
+        if self._differer("update_undirected", u, v, weight):
+            return
+        ponts_a_jour = self._ponts_a_jour and not self._arcs_asymetriques
+        self.update_edge_weight(u, v, weight)
+        self.update_edge_weight(v, u, weight)
+        self._ponts_a_jour = ponts_a_jour and not self._arcs_asymetriques
+    
+    def _fusion_composantes(self, u, v, weight):
+        """
+        Relie deux composantes disjointes A (contenant u) et B (contenant v).
+        
+        Tout plus court chemin de A vers B passe par la nouvelle arête, donc
+        d(s,t) = d(s,u) + weight + d(v,t) : le bloc A×B est une somme externe
+        des deux colonnes de distances, et TotDist augmente de
+        |B|·(d(s,u) + weight) + Σ d(v,·) pour s ∈ A (symétriquement pour B).
+        Les distances internes à A et à B sont inchangées.
+        """
+        for a, b in ((u, v), (v, u)):
+            self.G.add_edge(a, b, weight=weight)
+            self.W.setdefault(a, {})[b] = weight
+        self._marquer_arc(u, v)
+        
+        # Graphe symétrique : d(s,u) = d(u,s), la colonne de u est la ligne D[u]
+        A, B = list(self.D[u]), list(self.D[v])
+        # Le type (entier ou flottant) suit celui des distances et du poids
+        dA = np.array(list(self.D[u].values()))
+        dB = np.array(list(self.D[v].values()))
+        
+        for sources, cibles, bloc in ((A, B, dA[:, None] + weight + dB[None, :]),
+                                      (B, A, dB[:, None] + weight + dA[None, :])):
+            for s, ligne in zip(sources, bloc.tolist()):
+                self.D[s].update(zip(cibles, ligne))
+                if self.Ecc is not None:
+                    self._ajouter_comptes(s, Counter(ligne))
+                if self.R is not None:
+                    for t, d in zip(cibles, ligne):
+                        self.R.setdefault(t, {}).setdefault(d, set()).add(s)
+        if self.Sigma is not None:
+            self._sigma_sales.update(A + B)
+        
+        totA = np.array([self.TotDist[s] for s in A]) + (len(B) * (dA + weight) + dB.sum())
+        totB = np.array([self.TotDist[t] for t in B]) + (len(A) * (dB + weight) + dA.sum())
+        self.SommeDist += (totA.sum() - sum(self.TotDist[s] for s in A)
+                           + totB.sum() - sum(self.TotDist[t] for t in B)).item()
+        self.NbPaires += 2 * len(A) * len(B)
+        self.TotDist.update(zip(A, totA.tolist()))
+        self.TotDist.update(zip(B, totB.tolist()))
+        self._colonnes_symetriques(A + B)
+        
+        for s in A + B:
+            self._update_closeness(s)
     
     def remove_undirected_edge(self, u, v, weight=1):
         """
         Supprime une arête non orientée u--v en supprimant les deux arêtes
         orientées u→v et v→u.
+        
+        Si l'arête est un pont d'un graphe symétrique, la composante est
+        coupée arithmétiquement (_scission_pont), sans BFS.
         """
+        if self._differer("remove_undirected", u, v, weight):
+            return
+        if (u != v and self.G.has_edge(u, v) and self._raccourcis_symetriques()
+                and self._est_pont(u, v)):
+            self._scission_pont(u, v)
+            return
+        
         self.DELETEEDGESHRINKING(u, v, weight)
         self.DELETEEDGESHRINKING(v, u, weight)
+        # Supprimer une arête qui n'est pas un pont peut en créer de nouveaux
+        self._ponts_a_jour = False
+    
+    def _scission_pont(self, u, v):
+        """
+        Supprime le pont u--v. La composante se coupe en S_u et S_v : x est
+        du côté de u si et seulement si d(u,x) < d(v,x). Les distances
+        internes à chaque côté ne passaient pas par le pont et restent
+        valides ; pour s ∈ S_u, TotDist perd
+        Σ_{t ∈ S_v} d(s,t) = |S_v|·(d(s,u) + w) + Σ_{t ∈ S_v} d(v,t).
+        """
+        w = self.W[u][v]
+        for a, b in ((u, v), (v, u)):
+            self.G.remove_edge(a, b)
+            del self.W[a][b]
+        self._marquer_arc(u, v)
+        self.ponts.discard(frozenset((u, v)))
+        
+        Du, Dv = self.D[u], self.D[v]
+        S_u = [x for x in Du if Du[x] < Dv[x]]
+        S_v = [x for x in Dv if Dv[x] < Du[x]]
+        
+        self.NbPaires -= 2 * len(S_u) * len(S_v)
+        for cote, autre, Dc, Da in ((S_u, S_v, Du, Dv), (S_v, S_u, Dv, Du)):
+            # Σ d(v,t) sur le côté opposé, d(s,u) = D[u][s] par symétrie
+            somme_autre = sum(Da[t] for t in autre)
+            ensemble = set(cote)
+            for s in cote:
+                retrait = len(autre) * (Dc[s] + w) + somme_autre
+                self.TotDist[s] -= retrait
+                self.SommeDist -= retrait
+                ligne = self.D[s]
+                if self.R is not None:
+                    # Seules les paires qui traversaient le pont quittent R
+                    for t in autre:
+                        self._retirer_inverse(s, t, ligne[t])
+                if self.Ecc is not None:
+                    self._ajouter_comptes(s, Counter(ligne[t] for t in autre), -1)
+                if len(autre) <= len(cote):
+                    for t in autre:
+                        del ligne[t]
+                else:
+                    self.D[s] = {t: d for t, d in ligne.items() if t in ensemble}
+        self._colonnes_symetriques(S_u + S_v)
+        if self.Sigma is not None:
+            self._sigma_sales.update(S_u + S_v)
+        
+        for s in S_u + S_v:
+            self._update_closeness(s)
+    
+    # ==========================================================================
+    # Nombres de plus courts chemins (σ) et betweenness
+    # ==========================================================================
+    def enable_betweenness(self):
+        """
+        Active le maintien de σ(s,t) et des dépendances de Brandes par source.
+        Les écritures dans D et les passes d'insertion / suppression marquent
+        les sources dont le DAG des plus courts chemins change (y compris à
+        distances égales) ; seules ces sources sont recalculées, depuis D et
+        sans BFS, à la requête suivante.
+        """
+        self.Sigma, self.Dependance, self.BC = {}, {}, {}
+        self._sigma_sales = set(self.D)
+    
+    def disable_betweenness(self):
+        """Désactive et libère σ, les dépendances et la betweenness."""
+        self.Sigma = self.Dependance = self.BC = self._sigma_sales = None
+    
+    def _sigma_source(self, s):
+        """
+        σ(s,·) et dépendances δ_s(·) lues sur D[s] : les prédécesseurs de t
+        dans le DAG sont les p avec D[s][p] + W[p][t] = D[s][t] (prédicat SP),
+        parcourus par distance croissante puis décroissante.
+        """
+        ligne = self.D[s]
+        ordre = sorted(ligne, key=ligne.__getitem__)
+        unitaires = self._all_unit_weights()
+        sigma = {s: 1}
+        dag = {}
+        for t in ordre:
+            if t == s:
+                continue
+            dt = ligne[t]
+            if unitaires:
+                # Distances entières : comparaison exacte, sans lire W
+                preds = [p for p in self.G.predecessors(t) if ligne.get(p) == dt - 1]
+            else:
+                preds = [p for p in self.G.predecessors(t)
+                         if p in ligne and abs(ligne[p] + self.W[p][t] - dt) < 1e-9]
+            dag[t] = preds
+            sigma[t] = sum(sigma[p] for p in preds)
+        
+        dependance = dict.fromkeys(ordre, 0.0)
+        for t in reversed(ordre):
+            if t == s:
+                continue
+            coef = (1 + dependance[t]) / sigma[t]
+            for p in dag[t]:
+                dependance[p] += sigma[p] * coef
+        del dependance[s]
+        return sigma, {t: d for t, d in dependance.items() if d}
+    
+    def _actualiser_betweenness(self):
+        """Recalcule σ et les dépendances des sources marquées et reporte l'écart dans BC."""
+        self.flush()
+        if self.Sigma is None:
+            raise ValueError("Betweenness non maintenue : appeler enable_betweenness()")
+        for s in self._sigma_sales:
+            for t, d in self.Dependance.pop(s, {}).items():
+                self.BC[t] -= d
+            self.Sigma.pop(s, None)
+            if s in self.D:
+                self.Sigma[s], dependance = self._sigma_source(s)
+                self.Dependance[s] = dependance
+                for t, d in dependance.items():
+                    self.BC[t] = self.BC.get(t, 0.0) + d
+        self._sigma_sales = set()
+    
+    def get_path_count(self, s, t):
+        """Nombre de plus courts chemins de s à t (0 si t est inatteignable)."""
+        self._actualiser_betweenness()
+        return self.Sigma.get(s, {}).get(t, 0)
+    
+    def get_betweenness(self, node):
+        """
+        Betweenness de node, normalisée comme NetworkX par (n-1)(n-2) (un
+        graphe non orienté compte chaque paire dans les deux sens, ce qui
+        donne la même valeur que nx.betweenness_centrality sur le Graph).
+        """
+        echelle = self._echelle_betweenness()
+        return self.BC.get(node, 0.0) * echelle
+    
+    def get_all_betweenness(self):
+        """Retourne un dictionnaire de toutes les betweenness normalisées."""
+        echelle = self._echelle_betweenness()
+        return {x: self.BC.get(x, 0.0) * echelle for x in self.G}
+    
+    def _echelle_betweenness(self):
+        self._actualiser_betweenness()
+        if self.watch is not None:
+            raise ValueError("La betweenness suppose toutes les sources (mode suivi actif)")
+        self._distances_completes("La betweenness")
+        n = len(self.G)
+        return 1 / ((n - 1) * (n - 2)) if n > 2 else 1.0
+    
+    # ==========================================================================
+    # Sources suivies : distances maintenues pour un sous-ensemble de nœuds
+    # ==========================================================================
+    def watch_sources(self, nodes):
+        """
+        Ajoute des nœuds aux sources suivies. Au premier appel, le moteur
+        passe en mode suivi : les lignes D des autres sources sont libérées
+        et seules les sources suivies sont ensuite mises à jour. Chaque
+        nouvelle source suivie est calculée par un seul BFS (Dijkstra si
+        pondéré). Un nœud suivi absent du graphe le sera dès son ajout.
+        """
+        self._hors_transaction("watch_sources")
+        self.flush()
+        nodes = set(nodes)
+        if self.watch is None:
+            self.watch = set()
+            for s in [s for s in self.D if s not in nodes]:
+                self._del_row(s)
+                self._retirer_closeness(s)
+            # Les raccourcis (fusion, ponts) supposent toutes les lignes D
+            self._ponts_a_jour = False
+        
+        for x in nodes - self.watch:
+            self.watch.add(x)
+            if x in self.G and x not in self.D:
+                self._set_row(x, self._distances_depuis(x))
+                self._update_closeness(x)
+    
+    def unwatch_sources(self, nodes):
+        """Retire des nœuds des sources suivies et libère leurs lignes D."""
+        self._hors_transaction("unwatch_sources")
+        self.flush()
+        if self.watch is None:
+            self.watch = set(self.G.nodes())
+            self._ponts_a_jour = False
+        for x in nodes:
+            self.watch.discard(x)
+            self._del_row(x)
+            self._retirer_closeness(x)
+    
+    def watch_all(self):
+        """Revient au suivi de toutes les sources (reconstruction complète)."""
+        self._hors_transaction("watch_all")
+        self.flush()
+        if self.watch is not None:
+            self.watch = None
+            self._ponts_a_jour = False
+            self._rebuild()
+    
+    # ==========================================================================
+    # Transactions : journal d'annulation, rollback en O(entrées modifiées)
+    # ==========================================================================
+    def begin(self):
+        """
+        Ouvre une transaction. Jusqu'à commit() ou rollback(), chaque
+        écriture dans D (entrée ou ligne), dans C et dans G est précédée de
+        l'enregistrement de l'ancienne valeur ; rollback() les restaure sans
+        refaire de BFS. Le journal du mode différé est vidé d'abord.
+        """
+        if self._annulation is not None:
+            raise ValueError("Une transaction est déjà ouverte")
+        self.flush()
+        self._annulation = []
+    
+    def commit(self):
+        """Valide la transaction et libère le journal d'annulation."""
+        if self._annulation is None:
+            raise ValueError("Aucune transaction ouverte")
+        self._annulation = None
+    
+    def rollback(self):
+        """
+        Annule la transaction : le journal est rejoué à l'envers à travers
+        les écritures de D, qui restaurent aussi TotDist, les agrégats et
+        les index optionnels. Les modifications encore en attente dans le
+        journal du mode différé sont abandonnées.
+        """
+        if self._annulation is None:
+            raise ValueError("Aucune transaction ouverte")
+        annulation, self._annulation = self._annulation, None
+        self._journal = []
+        for entree in reversed(annulation):
+            genre = entree[0]
+            if genre == "dist":
+                _, s, t, ancien = entree
+                if ancien is None:
+                    self._del_dist(s, t)
+                else:
+                    self._set_dist(s, t, ancien)
+            elif genre == "ligne":
+                _, s, ancienne = entree
+                if ancienne is None:
+                    self._del_row(s)
+                else:
+                    self._set_row(s, ancienne)
+            elif genre == "C":
+                _, x, ancien = entree
+                if self._publication_sales is not None:
+                    self._publication_sales.add(x)
+                if ancien is None:
+                    self.C.pop(x, None)
+                else:
+                    self.C[x] = ancien
+            else:
+                self._restaurer_graphe(*entree[1:])
+        self._ponts_a_jour = False
+    
+    def _hors_transaction(self, operation):
+        if self._annulation is not None:
+            raise ValueError(f"{operation} n'est pas disponible pendant une transaction")
+    
+    def _noter_graphe(self, operation, args):
+        """Enregistre l'état des nœuds et arcs que l'opération va modifier."""
+        if operation in ("add_node", "remove_node"):
+            x = args[0]
+            noeuds = [x]
+            arcs = list(self.G.in_edges(x)) + list(self.G.out_edges(x)) if x in self.G else []
+        else:
+            u, v = args[0], args[1]
+            noeuds = [u, v]
+            arcs = [(u, v), (v, u)] if operation.endswith("undirected") else [(u, v)]
+        presents = {x: x in self.G for x in noeuds}
+        poids = {(a, b): self.W.get(a, {}).get(b) for a, b in arcs}
+        self._annulation.append(("graphe", presents, poids))
+    
+    def _restaurer_graphe(self, presents, poids):
+        """
+        Remet les nœuds et arcs notés par _noter_graphe dans leur état
+        d'alors. Un arc restauré peut changer σ sans changer les distances
+        (arc serré) : les sources qui atteignent son origine sont marquées
+        pour la betweenness.
+        """
+        if self._sigma_sales is not None:
+            origines = {a for a, _ in poids}
+            self._sigma_sales.update(s for s, ligne in self.D.items() if not origines.isdisjoint(ligne))
+        for x, present in presents.items():
+            if present and x not in self.G:
+                self.G.add_node(x)
+                self.W[x] = {}
+        for (a, b), c in poids.items():
+            if c is None:
+                if self.G.has_edge(a, b):
+                    self.G.remove_edge(a, b)
+                    del self.W[a][b]
+            else:
+                self.G.add_edge(a, b, weight=c)
+                self.W.setdefault(a, {})[b] = c
+            self._marquer_arc(a, b)
+        for x, present in presents.items():
+            if not present and x in self.G:
+                self.G.remove_node(x)
+                self.W.pop(x, None)
+                for succ in self.W.values():
+                    succ.pop(x, None)
+    
+    # ==========================================================================
+    # Publication : versions immuables de C pour des lecteurs concurrents
+    # ==========================================================================
+    def enable_publication(self, nb_blocs=NB_BLOCS_PUBLICATION):
+        """
+        Active la publication de versions de la closeness. L'écrivain appelle
+        publish() après chaque opération ou lot ; les lecteurs d'autres
+        threads lisent snapshot() sans verrou et voient une version cohérente,
+        jamais un état intermédiaire d'une mise à jour.
+        """
+        self.flush()
+        blocs = [{} for _ in range(nb_blocs)]
+        for x, c in self.C.items():
+            blocs[hash(x) % nb_blocs][x] = c
+        self._publication_sales = set()
+        self._version = VersionPubliee(0, blocs, len(self.G), self._agregats_publies())
+        return self._version
+    
+    def disable_publication(self):
+        """Désactive la publication (la dernière version reste lisible par ses détenteurs)."""
+        self._version = self._publication_sales = None
+    
+    def _agregats_publies(self):
+        # Mode local : les agrégats globaux ne sont pas définis (lignes tronquées)
+        if self.rayon is not None:
+            return {}
+        return {
+            "total_distance": self.SommeDist,
+            "connected_pairs": self.NbPaires,
+            "average_path_length": self.SommeDist / self.NbPaires if self.NbPaires else 0.0,
+        }
+    
+    def publish(self):
+        """
+        Publie l'état courant de C. Copie sur écriture : la nouvelle version
+        partage les blocs de la précédente et seuls les blocs contenant un
+        nœud modifié depuis la dernière publication sont recopiés. Le
+        remplacement de self._version est une seule affectation, atomique
+        pour les lecteurs.
+        """
+        if self._version is None:
+            raise ValueError("Publication non activée : appeler enable_publication()")
+        self._hors_transaction("publish")
+        self.flush()
+        blocs = list(self._version.blocs)
+        recopies = {}
+        for x in self._publication_sales:
+            i = hash(x) % len(blocs)
+            if i not in recopies:
+                recopies[i] = blocs[i] = dict(blocs[i])
+            if x in self.C:
+                blocs[i][x] = self.C[x]
+            else:
+                blocs[i].pop(x, None)
+        self._publication_sales = set()
+        self._version = VersionPubliee(self._version.numero + 1, blocs, len(self.G),
+                                       self._agregats_publies())
+        return self._version
+    
+    def snapshot(self):
+        """Dernière version publiée (lecture sans verrou, depuis n'importe quel thread)."""
+        return self._version
+    
+    # ==========================================================================
+    # Mode différé : journal des modifications, appliqué à la requête
+    # ==========================================================================
+    def set_deferred(self, actif=True):
+        """
+        Active ou désactive le mode différé. En mode différé, les méthodes de
+        modification ne font qu'ajouter une entrée au journal ; G, D et C ne
+        reflètent les modifications qu'après flush() (appelé par
+        get_closeness / get_all_closeness). Désactiver le mode vide le journal.
+        """
+        if not actif:
+            self.flush()
+        self.deferred = actif
+    
+    def _differer(self, operation, *args):
+        """Journalise l'opération en mode différé ; renvoie True si elle l'a été."""
+        if not self.deferred or self._vidage:
+            if self._annulation is not None:
+                self._noter_graphe(operation, args)
+            return False
+        self._journal.append((operation, args))
+        return True
+    
+    def _graphe_final(self):
+        """Applique le journal à une copie de G (sans distances)."""
+        H = self.G.copy()
+        for operation, args in self._journal:
+            if operation == "add_node":
+                H.add_node(args[0])
+            elif operation == "remove_node":
+                if args[0] in H:
+                    H.remove_node(args[0])
+            elif operation in ("update", "update_undirected"):
+                u, v, c = args
+                arcs = [(u, v)] if operation == "update" else [(u, v), (v, u)]
+                for a, b in arcs:
+                    if H.has_edge(a, b):
+                        H[a][b]['weight'] = c
+            elif operation in ("insert", "add_undirected"):
+                u, v, c = args
+                arcs = [(u, v)] if operation == "insert" else [(u, v), (v, u)]
+                for a, b in arcs:
+                    H.add_edge(a, b, weight=c)
+            else:
+                u, v, c = args
+                arcs = [(u, v)] if operation == "delete" else [(u, v), (v, u)]
+                for a, b in arcs:
+                    if H.has_edge(a, b):
+                        H.remove_edge(a, b)
+        return H
+    
+    def flush(self):
+        """
+        Applique les modifications journalisées. Le journal est d'abord
+        réduit à son effet net (différence entre G et le graphe final : une
+        arête ajoutée puis retirée disparaît), puis le coût des mises à jour
+        incrémentales de cet effet net est comparé à celui d'une
+        reconstruction complète du graphe final ; la moins chère est appliquée.
+        """
+        if not self._journal:
+            return
+        H = self._graphe_final()
+        self._journal = []
+        
+        def poids(graphe, a, b):
+            return graphe[a][b].get('weight', 1)
+        
+        noeuds_supprimes = [x for x in self.G if x not in H]
+        noeuds_ajoutes = [x for x in H if x not in self.G]
+        arcs_supprimes = [(a, b, poids(self.G, a, b)) for a, b in self.G.edges()
+                          if a in H and b in H and not H.has_edge(a, b)]
+        arcs_ajoutes = [(a, b, poids(H, a, b)) for a, b in H.edges() if not self.G.has_edge(a, b)]
+        arcs_modifies = [(a, b, poids(H, a, b)) for a, b in H.edges()
+                         if self.G.has_edge(a, b) and poids(H, a, b) != poids(self.G, a, b)]
+        
+        self._vidage = True
+        try:
+            # En transaction, le lot passe par les méthodes journalisées
+            if (self._annulation is None
+                    and self._choisir_rebuild_lot(H, noeuds_supprimes, arcs_supprimes, arcs_ajoutes, arcs_modifies)):
+                self.G = H
+                self.W = {x: {y: poids(H, x, y) for y in H.successors(x)} for x in H}
+                self._poids_unitaires = None
+                self._arcs_asymetriques = set()
+                self._arcs_nuls = set()
+                for a, b in H.edges():
+                    self._marquer_arc(a, b)
+                self._ponts_a_jour = False
+                self._rebuild()
+                return
+            
+            self._appliquer_arcs(arcs_supprimes, self.remove_undirected_edge, self.DELETEEDGESHRINKING)
+            self._appliquer_arcs(arcs_modifies, self.update_undirected_edge_weight, self.update_edge_weight)
+            for x in noeuds_supprimes:
+                self.remove_node(x)
+            for x in noeuds_ajoutes:
+                self.add_node(x)
+            self._appliquer_arcs(arcs_ajoutes, self.add_undirected_edge, self.INSERTEDGEGROWING)
+        finally:
+            self._vidage = False
+    
+    def _appliquer_arcs(self, arcs, non_oriente, oriente):
+        """Applique des arcs, en regroupant x→y et y→x de même poids en une arête non orientée."""
+        restants = {(a, b): c for a, b, c in arcs}
+        for (a, b), c in list(restants.items()):
+            if (a, b) not in restants:
+                continue
+            del restants[(a, b)]
+            if restants.get((b, a)) == c:
+                del restants[(b, a)]
+                non_oriente(a, b, c)
+            else:
+                oriente(a, b, c)
+    
+    def _choisir_rebuild_lot(self, H, noeuds_supprimes, arcs_supprimes, arcs_ajoutes, arcs_modifies):
+        """
+        Compare le coût estimé du lot en incrémental (sources affectées par
+        chaque changement net, d'après les distances actuelles) à celui d'une
+        reconstruction du graphe final H. L'estimation s'arrête dès qu'elle
+        dépasse le coût de reconstruction.
+        """
+        if not self.adaptive:
+            return False
+        
+        n, m = len(H), H.number_of_edges()
+        nb_sources = n if self.watch is None else sum(1 for s in self.watch if s in H)
+        cout_rebuild = nb_sources * (n + m)
+        # Même règle que _cout_rebuild : pas de remise bit-parallèle avec l'index inverse
+        if self.R is None and all(c == 1 for _, _, c in H.edges(data='weight', default=1)):
+            cout_rebuild *= self.cout_relatif_rebuild
+        
+        cout = 0
+        lignes = list(self.D.values())
+        for x in noeuds_supprimes:
+            if cout >= cout_rebuild:
+                break
+            cout += self._cout_incremental("delete", x, sum(1 for Ds in lignes if x in Ds))
+        for u, v, c in arcs_supprimes:
+            if cout >= cout_rebuild:
+                break
+            nb = sum(1 for Ds in lignes if u in Ds and v in Ds and abs(Ds[u] + c - Ds[v]) < 1e-9)
+            cout += self._cout_incremental("delete", v, nb)
+        for u, v, c in arcs_ajoutes:
+            if cout >= cout_rebuild:
+                break
+            nb = sum(1 for Ds in lignes if Ds.get(u, math.inf) + c < Ds.get(v, math.inf))
+            cout += self._cout_incremental("insert", v, nb)
+        for u, v, c in arcs_modifies:
+            if cout >= cout_rebuild:
+                break
+            ancien = self.W[u][v]
+            if c < ancien:
+                nb = sum(1 for Ds in lignes if Ds.get(u, math.inf) + c < Ds.get(v, math.inf))
+                cout += self._cout_incremental("insert", v, nb)
+            else:
+                cout += self._cout_incremental("delete", v, len(self._sources_sur_arc(u, v, ancien)))
+        
+        rebuild = cout_rebuild < cout
+        self.compteurs_strategie["rebuild" if rebuild else "incremental"] += 1
+        logger.debug("vidage: %d nœuds supprimés, %d arcs supprimés, %d arcs ajoutés, "
+                     "%d poids modifiés, coût incrémental %.0f, coût reconstruction %.0f -> %s",
+                     len(noeuds_supprimes), len(arcs_supprimes), len(arcs_ajoutes), len(arcs_modifies),
+                     cout, cout_rebuild, "reconstruction" if rebuild else "incrémental")
+        return rebuild
+    
+    # ==========================================================================
+    # Évaluation « et si » d'insertions candidates, sans modifier D
+    # ==========================================================================
+    def evaluate_insertions(self, candidates, weight=1):
+        """
+        Variation de la closeness de x si l'on ajoutait l'arête x→y (ou
+        x--y), pour chaque candidat (x, y) ou (x, y, poids).
+        
+        Un plus court chemin depuis x n'emprunte la nouvelle arête qu'en
+        premier pas, donc d'(x,t) = min(d(x,t), w + d(y,t)) : pour un bloc
+        de candidats, c'est un minimum entre la ligne dense de x et les
+        lignes denses des y décalées de w, suivi de réductions par ligne.
+        L'arc retour y→x ne change pas les distances depuis x, le résultat
+        vaut pour une arête orientée comme non orientée. D n'est pas modifié.
+        
+        Returns:
+            dict: {candidat: C'(x) - C(x)}, indexé par le tuple candidat tel que fourni
+        """
+        self.flush()
+        noeuds = list(self.G)
+        n = len(noeuds)
+        position = {x: i for i, x in enumerate(noeuds)}
+        lignes_denses = {}
+        
+        def ligne_dense(x):
+            if x not in lignes_denses:
+                if x not in self.D:
+                    raise ValueError(f"Pas de distances maintenues depuis {x}")
+                ligne = np.full(n, np.inf)
+                ligne[[position[t] for t in self.D[x]]] = list(self.D[x].values())
+                lignes_denses[x] = ligne
+            return lignes_denses[x]
+        
+        par_source = {}
+        for candidat in candidates:
+            candidat = tuple(candidat)
+            x, y = candidat[0], candidat[1]
+            c = verifier_poids(candidat[2] if len(candidat) > 2 else weight)
+            par_source.setdefault(x, []).append((candidat, y, c))
+        
+        deltas = {}
+        for x, cibles in par_source.items():
+            dx = ligne_dense(x)
+            for debut in range(0, len(cibles), TAILLE_BLOC_CANDIDATS):
+                bloc = cibles[debut:debut + TAILLE_BLOC_CANDIDATS]
+                Dy = np.stack([ligne_dense(y) for _, y, _ in bloc])
+                poids = np.array([c for _, _, c in bloc], dtype=float)[:, None]
+                nouvelles = np.minimum(dx[None, :], Dy + poids)
+                # Mode local : les distances au-delà du rayon ne comptent pas
+                nouvelles[nouvelles > self._limite()] = np.inf
+                finies = np.isfinite(nouvelles)
+                reachable = finies.sum(axis=1) - 1
+                totdist = np.where(finies, nouvelles, 0).sum(axis=1)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    C = np.where((reachable > 0) & (totdist > 0) & (n > 1),
+                                 reachable / totdist * reachable / max(n - 1, 1), 0.0)
+                ancienne = self.C.get(x, 0.0)
+                for (candidat, _, _), valeur in zip(bloc, C.tolist()):
+                    deltas[candidat] = valeur - ancienne
+        return deltas
+    
+    # ==========================================================================
+    # Points de reprise : état complet du moteur sur disque
+    # ==========================================================================
+    def save_checkpoint(self, path):
+        """
+        Écrit l'état complet du moteur (G, W, D, TotDist, C, modes et index
+        optionnels) dans path. Le journal différé est appliqué d'abord ;
+        l'écriture passe par un fichier temporaire renommé, un point de
+        reprise est donc toujours complet.
+        """
+        self._hors_transaction("save_checkpoint")
+        self.flush()
+        temporaire = f"{path}.tmp"
+        with open(temporaire, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporaire, path)
+    
+    @classmethod
+    def load_checkpoint(cls, path):
+        """Recharge un moteur écrit par save_checkpoint."""
+        with open(path, "rb") as f:
+            incr = pickle.load(f)
+        if not isinstance(incr, cls):
+            raise ValueError(f"{path} ne contient pas un {cls.__name__}")
+        return incr
     
     def get_closeness(self, node):
         """Retourne la closeness centrality d'un nœud."""
+        self.flush()
         return self.C.get(node, 0.0)
     
     def get_all_closeness(self):
         """Retourne un dictionnaire de toutes les closeness centralities."""
+        self.flush()
         return self.C.copy()
+    
+    def _distances_completes(self, quoi):
+        """Lève ValueError en mode local : les lignes D sont tronquées au rayon."""
+        self.flush()
+        if self.rayon is not None:
+            raise ValueError(f"{quoi} suppose les distances complètes (mode local, rayon {self.rayon})")
+    
+    def get_total_distance(self):
+        """Somme des distances sur toutes les paires ordonnées connectées."""
+        self._distances_completes("La somme des distances")
+        return self.SommeDist
+    
+    def get_connected_pairs(self):
+        """Nombre de paires ordonnées (s, t), s ≠ t, avec t atteignable depuis s."""
+        self._distances_completes("Le nombre de paires connectées")
+        return self.NbPaires
+    
+    def get_wiener_index(self):
+        """
+        Indice de Wiener : somme des distances sur les paires connectées,
+        non ordonnées si le graphe est symétrique (chaque paire compte une
+        fois), ordonnées sinon.
+        """
+        self._distances_completes("L'indice de Wiener")
+        if not self._arcs_asymetriques:
+            return self.SommeDist / 2
+        return self.SommeDist
+    
+    def get_average_path_length(self):
+        """Longueur moyenne des plus courts chemins sur les paires connectées."""
+        self._distances_completes("La longueur moyenne des chemins")
+        return self.SommeDist / self.NbPaires if self.NbPaires else 0.0
+    
+    def _verifier_ecc(self):
+        self._distances_completes("L'excentricité")
+        if self.Ecc is None:
+            raise ValueError("Excentricités non maintenues : appeler enable_eccentricity()")
+    
+    def get_eccentricity(self, node):
+        """
+        Excentricité de node : plus grande distance vers un nœud atteignable
+        (les nœuds inatteignables sont ignorés, comme dans TotDist).
+        """
+        self._verifier_ecc()
+        return self.Ecc.get(node, 0)
+    
+    def _ecc_globale(self):
+        self._verifier_ecc()
+        if self.watch is not None:
+            raise ValueError("Rayon, diamètre et centre supposent toutes les sources (mode suivi actif)")
+        return self._ecc_triees
+    
+    def get_radius(self):
+        """Plus petite excentricité (0 pour un graphe vide)."""
+        valeurs = self._ecc_globale()
+        return valeurs[0] if valeurs else 0
+    
+    def get_diameter(self):
+        """Plus grande distance finie du graphe (0 pour un graphe vide)."""
+        valeurs = self._ecc_globale()
+        return valeurs[-1] if valeurs else 0
+    
+    def get_center(self):
+        """Ensemble des nœuds d'excentricité minimale."""
+        valeurs = self._ecc_globale()
+        return set(self.SourcesParEcc[valeurs[0]]) if valeurs else set()
+    
+    def get_out_closeness(self, node):
+        """Closeness sortante (distances depuis node) : identique à get_closeness."""
+        return self.get_closeness(node)
+    
+    def get_in_closeness(self, node):
+        """
+        Closeness entrante (distances vers node), même normalisation que la
+        closeness sortante avec reachable = nombre de nœuds atteignant node.
+        Suppose enable_in_closeness et toutes les sources maintenues.
+        """
+        self._distances_completes("La closeness entrante")
+        if self.TotDistIn is None:
+            raise ValueError("Closeness entrante non maintenue : appeler enable_in_closeness()")
+        if self.watch is not None:
+            raise ValueError("La closeness entrante suppose toutes les sources (mode suivi actif)")
+        n = len(self.G)
+        reachable = self.NbIn.get(node, 1) - 1
+        totdist = self.TotDistIn.get(node, 0)
+        if n <= 1 or reachable == 0 or totdist == 0:
+            return 0.0
+        return (reachable / totdist) * (reachable / (n - 1))
+    
+    def get_all_in_closeness(self):
+        """Retourne un dictionnaire de toutes les closeness entrantes."""
+        return {node: self.get_in_closeness(node) for node in self.G}
+
+
+class VersionPubliee:
+    """
+    Version immuable de la closeness publiée par IncrementalClosenessArticle.
+    Les blocs (dictionnaires nœud -> closeness) ne sont jamais modifiés après
+    publication ; une version peut donc être lue par plusieurs threads
+    pendant que l'écrivain prépare la suivante.
+    """
+    
+    def __init__(self, numero, blocs, nb_noeuds, agregats):
+        self.numero = numero
+        self.blocs = blocs
+        self.nb_noeuds = nb_noeuds
+        self.agregats = agregats
+        # (k, k meilleurs) remplacé en une seule affectation : un lecteur
+        # concurrent voit l'ancien couple ou le nouveau, jamais un mélange
+        self._top = (0, [])
+    
+    def closeness(self, node):
+        """Closeness de node dans cette version (0 si absent)."""
+        return self.blocs[hash(node) % len(self.blocs)].get(node, 0.0)
+    
+    def all_closeness(self):
+        """Dictionnaire complet de la closeness de cette version."""
+        resultat = {}
+        for bloc in self.blocs:
+            resultat.update(bloc)
+        return resultat
+    
+    def top_k(self, k):
+        """
+        Les k nœuds de plus forte closeness, [(nœud, closeness)] par ordre
+        décroissant. Calculé à la première demande puis gardé avec la
+        version (un calcul concurrent donne le même résultat).
+        """
+        k_calcule, top = self._top
+        if k > k_calcule:
+            paires = ((x, c) for bloc in self.blocs for x, c in bloc.items())
+            top = heapq.nlargest(k, paires, key=lambda paire: paire[1])
+            self._top = (k, top)
+        return top[:k]
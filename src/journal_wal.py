@@ -0,0 +1,161 @@
+"""
+Journal d'écriture anticipée (WAL) et reprise après arrêt brutal.
+
+Le dossier du journal contient :
+
+    checkpoint_<N>.pkl   état complet du moteur après l'opération N
+                         (IncrementalClosenessArticle.save_checkpoint)
+    wal_<N>.log          segment de journal commencé après le point de
+                         reprise N ; une ligne par opération appliquée :
+                         « <numéro> <action> », ex. « 42 addEdge n3 n7 »
+
+Les actions ont le format des fichiers de graphes dynamiques et sont
+rejouées par serveur_closeness.appliquer_action. noter() écrit dans le
+tampon du segment courant, synchroniser() le force sur disque (fsync) :
+l'appelant synchronise avant d'acquitter les opérations notées, une fois
+par lot.
+
+Au démarrage, recuperer() recharge le point de reprise le plus récent puis
+rejoue uniquement les lignes de numéro supérieur. Une dernière ligne
+incomplète (arrêt pendant une écriture) n'a jamais été acquittée : elle est
+coupée du segment.
+
+Rotation : checkpoint() écrit checkpoint_<N>.pkl, ouvre wal_<N>.log puis
+supprime les points de reprise et segments plus anciens. L'espace disque
+reste borné par un point de reprise et les opérations qui le suivent.
+"""
+
+import os
+import re
+
+from incremental_closeness_article import IncrementalClosenessArticle
+from serveur_closeness import appliquer_action
+
+OPERATIONS_PAR_CHECKPOINT = 10000
+_FICHIER = re.compile(r"^(checkpoint|wal)_(\d+)\.(pkl|log)$")
+
+
+class JournalWAL:
+    """
+    Journal d'écriture anticipée d'un moteur incrémental.
+
+    Args:
+        dossier: dossier des points de reprise et segments de journal
+        operations_par_checkpoint: nombre d'opérations journalisées au-delà
+            duquel doit_checkpoint() devient vrai
+    """
+
+    def __init__(self, dossier, operations_par_checkpoint=OPERATIONS_PAR_CHECKPOINT):
+        self.dossier = dossier
+        self.operations_par_checkpoint = operations_par_checkpoint
+        os.makedirs(dossier, exist_ok=True)
+        self.sequence = 0  # numéro de la dernière opération notée
+        self.dernier_checkpoint = 0
+        self._segment = None
+
+    def _fichiers(self, genre):
+        """Numéros des fichiers checkpoint ou wal présents, triés."""
+        numeros = []
+        for nom in os.listdir(self.dossier):
+            m = _FICHIER.match(nom)
+            if m and m.group(1) == genre:
+                numeros.append(int(m.group(2)))
+        return sorted(numeros)
+
+    def _chemin(self, genre, numero):
+        extension = "pkl" if genre == "checkpoint" else "log"
+        return os.path.join(self.dossier, f"{genre}_{numero}.{extension}")
+
+    def _synchroniser_dossier(self):
+        """Rend durables les créations, renommages et suppressions du dossier."""
+        fd = os.open(self.dossier, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def recuperer(self):
+        """
+        Reconstruit le moteur : dernier point de reprise (ou moteur vide),
+        puis rejeu de la fin du journal. Ouvre ensuite le journal en ajout.
+
+        Returns:
+            IncrementalClosenessArticle
+        """
+        checkpoints = self._fichiers("checkpoint")
+        if checkpoints:
+            self.dernier_checkpoint = checkpoints[-1]
+            incr = IncrementalClosenessArticle.load_checkpoint(
+                self._chemin("checkpoint", self.dernier_checkpoint))
+        else:
+            self.dernier_checkpoint = 0
+            incr = IncrementalClosenessArticle()
+        self.sequence = self.dernier_checkpoint
+
+        segments = self._fichiers("wal")
+        for numero in segments:
+            self._rejouer(incr, self._chemin("wal", numero))
+        incr.flush()
+
+        debut = segments[-1] if segments else self.dernier_checkpoint
+        self._segment = open(self._chemin("wal", debut), "a", encoding="utf-8")
+        if not segments:
+            self._synchroniser_dossier()
+        return incr
+
+    def _rejouer(self, incr, chemin):
+        """Rejoue les lignes du segment postérieures au point de reprise."""
+        complet = 0  # taille de la partie faite de lignes complètes
+        with open(chemin, "rb") as f:
+            for ligne in f:
+                if not ligne.endswith(b"\n"):
+                    break
+                complet += len(ligne)
+                numero, action = ligne.decode("utf-8").split(None, 1)
+                numero = int(numero)
+                if numero > self.sequence:
+                    appliquer_action(incr, action.split())
+                    self.sequence = numero
+        if complet < os.path.getsize(chemin):
+            with open(chemin, "r+b") as f:
+                f.truncate(complet)
+                os.fsync(f.fileno())
+
+    def noter(self, action):
+        """Ajoute une opération appliquée (ligne d'action) au segment courant."""
+        self.sequence += 1
+        self._segment.write(f"{self.sequence} {action}\n")
+
+    def synchroniser(self):
+        """Force les opérations notées sur disque ; à appeler avant de les acquitter."""
+        self._segment.flush()
+        os.fsync(self._segment.fileno())
+
+    def doit_checkpoint(self):
+        return self.sequence - self.dernier_checkpoint >= self.operations_par_checkpoint
+
+    def checkpoint(self, incr):
+        """
+        Écrit un point de reprise de incr (à jour de toutes les opérations
+        notées), commence un nouveau segment et supprime les fichiers
+        devenus inutiles.
+        """
+        self.synchroniser()
+        incr.save_checkpoint(self._chemin("checkpoint", self.sequence))
+        self._segment.close()
+        self._segment = open(self._chemin("wal", self.sequence), "a", encoding="utf-8")
+        self.dernier_checkpoint = self.sequence
+        self._synchroniser_dossier()
+        for numero in self._fichiers("checkpoint"):
+            if numero < self.sequence:
+                os.remove(self._chemin("checkpoint", numero))
+        for numero in self._fichiers("wal"):
+            if numero < self.sequence:
+                os.remove(self._chemin("wal", numero))
+        self._synchroniser_dossier()
+
+    def fermer(self):
+        if self._segment is not None:
+            self.synchroniser()
+            self._segment.close()
+            self._segment = None
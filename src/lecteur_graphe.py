@@ -1,6 +1,7 @@
 import os
-from graph import DynamicGraph
+from graph import DynamicGraph, verifier_poids
 from classical_closeness import compute_all_closeness_classical
+from actions_binaires import lire_actions_texte, etat_final
 
 
 
@@ -24,10 +25,22 @@ def to_int(label: str) -> int:
     return s
 
 
+def to_weight(label: str):
+    """
+    Convertit un poids d'arête : '3' -> 3, '0.5' -> 0.5. Lève ValueError
+    pour un poids négatif, infini, NaN ou trop grand (verifier_poids).
+    """
+    try:
+        poids = int(label)
+    except ValueError:
+        poids = float(label)
+    return verifier_poids(poids)
+
+
 def lire_fichier(nom_fichier: str) -> DynamicGraph:
     """
-    Lit un fichier d'actions (addNode, removeNode, addEdge, removeEdge)
-    et applique ces actions sur un DynamicGraph, puis renvoie le graphe.
+    Lit un fichier d'actions (addNode, removeNode, addEdge, removeEdge,
+    updateEdge) et applique ces actions sur un DynamicGraph, puis renvoie le graphe.
     """
     g = DynamicGraph()
 
@@ -60,12 +73,36 @@ def lire_fichier(nom_fichier: str) -> DynamicGraph:
                     g.remove_edge(n1, n2)
                 else:
                     print(f"Ligne {ln}: opération inconnue '{act}' (ignorée)")
+            elif args == 4:
+                # updateEdge nX nY w
+                act, n1, n2, w = parts
+                if act == "updateEdge":
+                    g.update_edge_weight(to_int(n1), to_int(n2), to_weight(w))
+                else:
+                    print(f"Ligne {ln}: opération inconnue '{act}' (ignorée)")
             else:
                 print(f"Ligne {ln}: format invalide (ignorée)")
 
     return g
 
 
+def lire_fichier_vectorise(nom_fichier: str) -> DynamicGraph:
+    """
+    Variante de lire_fichier pour les gros fichiers : le parsing est fait par
+    blocs avec des opérations NumPy vectorisées (actions_binaires.lire_actions_texte),
+    puis le graphe final est calculé sur les tableaux d'actions
+    (actions_binaires.etat_final) et chargé en bloc, sans rejouer les actions.
+
+    Les lignes invalides sont signalées avec leur numéro, comme dans lire_fichier.
+    Les lignes updateEdge ne sont pas prises en charge (format binaire sans poids).
+    """
+    g = DynamicGraph()
+    noeuds, u, v = etat_final(lire_actions_texte(nom_fichier))
+    g.G.add_nodes_from(noeuds.tolist())
+    g.G.add_edges_from(zip(u.tolist(), v.tolist()))
+    return g
+
+
 if __name__ == "__main__":
     # Exemple d'utilisation simple
     current_dir = os.path.dirname(os.path.abspath(__file__))
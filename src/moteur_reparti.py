@@ -0,0 +1,301 @@
+"""
+Moteur incrémental réparti sur plusieurs processus locaux.
+
+Chaque travailleur possède une copie complète du graphe (adjacence) et les
+lignes D d'un sous-ensemble de sources : les nœuds x tels que
+proprietaire(x) == indice du travailleur (mode suivi de
+IncrementalClosenessArticle). Le coordinateur diffuse chaque lot d'actions
+à tous les travailleurs par des pipes, puis agrège les réponses : la
+closeness d'un nœud est demandée à son propriétaire, le top-k fusionne les
+top-k locaux, les agrégats globaux (somme des distances, paires
+connectées) sont des sommes sur les travailleurs.
+
+Reprise : checkpoint() ouvre une nouvelle génération g : chaque travailleur
+écrit shard_<i>_<g>.pkl, puis le fichier « generation » (remplacé de façon
+atomique) désigne g et le nombre de travailleurs. Les actions reçues depuis
+sont ajoutées à actions_<g>.log. Un travailleur arrêté est relancé par
+redemarrer(i) : il recharge son point de reprise et le coordinateur lui
+rejoue les actions suivantes. Un nouveau coordinateur repart d'un dossier
+vide, sauf avec reprendre=True : il recharge alors la dernière génération
+complète et rejoue son journal d'actions.
+"""
+
+import heapq
+import multiprocessing
+import os
+import re
+
+from incremental_closeness_article import IncrementalClosenessArticle
+from lecteur_graphe import to_weight
+from serveur_closeness import appliquer_action
+from run_incremental import to_int
+
+# Nombre de mots (action comprise) de chaque action
+ARITES = {"addNode": 2, "removeNode": 2, "addEdge": 3, "removeEdge": 3, "updateEdge": 4}
+_FICHIER = re.compile(r"^(?:shard_\d+_(\d+)\.pkl|actions_(\d+)\.log|generation)$")
+
+
+def proprietaire(node, nb_travailleurs):
+    """Indice du travailleur qui maintient les distances depuis node."""
+    return hash(node) % nb_travailleurs
+
+
+def verifier_action(ligne):
+    """Lève ValueError si ligne n'est pas une action valide (verbe, arité, nœuds, poids)."""
+    parts = ligne.split()
+    if not parts or ARITES.get(parts[0]) != len(parts):
+        raise ValueError(f"action invalide: {ligne!r}")
+    for p in parts[1:min(len(parts), 3)]:
+        to_int(p)
+    if parts[0] == "updateEdge":
+        to_weight(parts[3])
+
+
+def _noeuds_cites(lignes):
+    """Nœuds mentionnés par des lignes d'actions (hors poids de updateEdge)."""
+    noeuds = set()
+    for ligne in lignes:
+        parts = ligne.split()
+        fin = 2 if parts[0] in ("addNode", "removeNode") else 3
+        noeuds.update(to_int(p) for p in parts[1:fin])
+    return noeuds
+
+
+def _travailleur(conn, indice, nb_travailleurs, checkpoint):
+    """
+    Boucle d'un travailleur : reçoit des messages (commande, argument) et
+    répond à chacun. Les actions d'un lot sont appliquées en mode différé
+    puis vidées en une fois. Une erreur est renvoyée au coordinateur au lieu
+    d'arrêter le travailleur.
+    """
+    if checkpoint is not None and os.path.exists(checkpoint):
+        incr = IncrementalClosenessArticle.load_checkpoint(checkpoint)
+    else:
+        incr = IncrementalClosenessArticle()
+        # Mode suivi dès le départ : aucune source n'est maintenue par défaut
+        incr.watch_sources([])
+        incr.set_deferred(True)
+
+    while True:
+        commande, argument = conn.recv()
+        try:
+            reponse = _executer(incr, indice, nb_travailleurs, commande, argument)
+        except (ValueError, IndexError, KeyError) as e:
+            reponse = e
+        conn.send(reponse)
+        if commande == "stop":
+            conn.close()
+            return
+
+
+def _executer(incr, indice, nb_travailleurs, commande, argument):
+    """Exécute une commande du coordinateur et renvoie la réponse."""
+    if commande == "actions":
+        # Les nœuds dont ce travailleur est propriétaire sont suivis avant
+        # leur création (ajout explicite ou implicite par une arête)
+        nouveaux = [x for x in _noeuds_cites(argument)
+                    if proprietaire(x, nb_travailleurs) == indice and x not in incr.watch]
+        if nouveaux:
+            incr.watch_sources(nouveaux)
+        for ligne in argument:
+            appliquer_action(incr, ligne.split())
+        incr.flush()
+        return len(argument)
+    if commande == "closeness":
+        return incr.get_closeness(argument)
+    if commande == "all":
+        return incr.get_all_closeness()
+    if commande == "topk":
+        return heapq.nlargest(argument, incr.get_all_closeness().items(), key=lambda p: p[1])
+    if commande == "stats":
+        return incr.get_total_distance(), incr.get_connected_pairs()
+    if commande == "checkpoint":
+        incr.save_checkpoint(argument)
+        return True
+    if commande == "stop":
+        return True
+    raise ValueError(f"commande inconnue: {commande}")
+
+
+class CoordinateurReparti:
+    """
+    Coordinateur : lance nb_travailleurs processus, leur diffuse les
+    actions et agrège leurs réponses.
+
+    Args:
+        nb_travailleurs: nombre de processus (une tranche de sources chacun)
+        dossier: dossier des points de reprise et du journal d'actions
+        reprendre: False (défaut) vide les fichiers de reprise du dossier ;
+            True repart de la dernière génération qui y a été écrite
+    """
+
+    def __init__(self, nb_travailleurs, dossier, reprendre=False):
+        self.nb_travailleurs = nb_travailleurs
+        self.dossier = dossier
+        os.makedirs(dossier, exist_ok=True)
+        self.generation = 0
+        # Actions reçues depuis le dernier point de reprise, rejouées à un
+        # travailleur relancé
+        self.depuis_checkpoint = []
+        if reprendre and os.path.exists(self._chemin("generation")):
+            self._relire()
+        else:
+            self._purger(garder=None)
+        self._journal = open(self._chemin(f"actions_{self.generation}.log"), "a", encoding="utf-8")
+        self.processus = [None] * nb_travailleurs
+        self.pipes = [None] * nb_travailleurs
+        for i in self._tous():
+            self._lancer(i)
+        if self.depuis_checkpoint:
+            self._demander(self._tous(), "actions", self.depuis_checkpoint)
+
+    def _chemin(self, nom):
+        return os.path.join(self.dossier, nom)
+
+    def _checkpoint(self, i, generation=None):
+        if generation is None:
+            generation = self.generation
+        return self._chemin(f"shard_{i}_{generation}.pkl")
+
+    def _relire(self):
+        """Relit la génération courante et son journal d'actions (lignes complètes)."""
+        with open(self._chemin("generation"), encoding="utf-8") as f:
+            generation, nb_travailleurs = map(int, f.read().split())
+        if nb_travailleurs != self.nb_travailleurs:
+            raise ValueError(f"{self.dossier} a été écrit par {nb_travailleurs} travailleurs, "
+                             f"pas {self.nb_travailleurs}")
+        self.generation = generation
+        journal = self._chemin(f"actions_{generation}.log")
+        if os.path.exists(journal):
+            with open(journal, encoding="utf-8") as f:
+                self.depuis_checkpoint = [l.strip() for l in f if l.endswith("\n") and l.strip()]
+
+    def _purger(self, garder):
+        """Supprime les fichiers de reprise, sauf ceux de la génération garder."""
+        for nom in os.listdir(self.dossier):
+            m = _FICHIER.match(nom)
+            if m is None:
+                continue
+            if garder is not None and (nom == "generation" or int(m.group(1) or m.group(2)) == garder):
+                continue
+            os.remove(self._chemin(nom))
+
+    def _lancer(self, i):
+        parent, enfant = multiprocessing.Pipe()
+        p = multiprocessing.Process(target=_travailleur,
+                                    args=(enfant, i, self.nb_travailleurs, self._checkpoint(i)),
+                                    daemon=True)
+        p.start()
+        enfant.close()
+        self.processus[i], self.pipes[i] = p, parent
+
+    def _demander(self, indices, commande, argument=None):
+        """
+        Envoie la commande aux travailleurs indices puis collecte leurs
+        réponses ; une erreur renvoyée par un travailleur est relevée.
+        """
+        for i in indices:
+            self.pipes[i].send((commande, argument))
+        reponses = [self.pipes[i].recv() for i in indices]
+        for reponse in reponses:
+            if isinstance(reponse, Exception):
+                raise reponse
+        return reponses
+
+    def _tous(self):
+        return range(self.nb_travailleurs)
+
+    def appliquer(self, lignes):
+        """
+        Diffuse un lot de lignes d'actions ('addEdge nX nY', ...) à tous les
+        travailleurs. Le lot est vérifié avant d'être diffusé : une ligne
+        invalide le fait rejeter en entier (ValueError).
+        """
+        lignes = [l.strip() for l in lignes if l.strip()]
+        for ligne in lignes:
+            verifier_action(ligne)
+        self._demander(self._tous(), "actions", lignes)
+        self.depuis_checkpoint.extend(lignes)
+        self._journal.write("".join(l + "\n" for l in lignes))
+        self._journal.flush()
+
+    def closeness(self, node):
+        """Closeness de node, demandée à son propriétaire."""
+        i = proprietaire(node, self.nb_travailleurs)
+        return self._demander([i], "closeness", node)[0]
+
+    def all_closeness(self):
+        """Closeness de tous les nœuds (union des tranches)."""
+        resultat = {}
+        for partie in self._demander(self._tous(), "all"):
+            resultat.update(partie)
+        return resultat
+
+    def top_k(self, k):
+        """Les k meilleurs nœuds : fusion des top-k locaux."""
+        locaux = self._demander(self._tous(), "topk", k)
+        return heapq.nlargest(k, (p for top in locaux for p in top), key=lambda p: p[1])
+
+    def stats(self):
+        """Somme des distances, paires connectées et longueur moyenne des chemins."""
+        total = paires = 0
+        for t, p in self._demander(self._tous(), "stats"):
+            total += t
+            paires += p
+        return {
+            "total_distance": total,
+            "connected_pairs": paires,
+            "average_path_length": total / paires if paires else 0.0,
+        }
+
+    def checkpoint(self):
+        """
+        Ouvre une nouvelle génération : chaque travailleur y écrit son point
+        de reprise, puis le fichier generation la désigne et le journal
+        d'actions repart à vide. Les fichiers des générations précédentes
+        sont ensuite supprimés.
+        """
+        generation = self.generation + 1
+        for i in self._tous():
+            self.pipes[i].send(("checkpoint", self._checkpoint(i, generation)))
+        for i in self._tous():
+            reponse = self.pipes[i].recv()
+            if isinstance(reponse, Exception):
+                raise reponse
+        journal = open(self._chemin(f"actions_{generation}.log"), "w", encoding="utf-8")
+        temporaire = self._chemin("generation.tmp")
+        with open(temporaire, "w", encoding="utf-8") as f:
+            f.write(f"{generation} {self.nb_travailleurs}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporaire, self._chemin("generation"))
+        self._journal.close()
+        self._journal = journal
+        self.generation = generation
+        self.depuis_checkpoint = []
+        self._purger(garder=generation)
+
+    def redemarrer(self, i):
+        """
+        Relance le travailleur i (arrêté ou défaillant) depuis son point de
+        reprise et lui rejoue les actions reçues depuis.
+        """
+        if self.processus[i].is_alive():
+            self.processus[i].terminate()
+        self.processus[i].join()
+        self.pipes[i].close()
+        self._lancer(i)
+        if self.depuis_checkpoint:
+            self._demander([i], "actions", self.depuis_checkpoint)
+
+    def fermer(self):
+        """Arrête tous les travailleurs."""
+        for i in self._tous():
+            if self.processus[i].is_alive():
+                try:
+                    self._demander([i], "stop")
+                except (EOFError, BrokenPipeError, ConnectionError):
+                    pass
+            self.processus[i].join()
+            self.pipes[i].close()
+        self._journal.close()
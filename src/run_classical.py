@@ -5,15 +5,18 @@ Ce script traite chaque graphe dynamique avec l'algorithme classique
 (recalcul complet à chaque étape) et sauvegarde les temps dans un fichier JSON.
 """
 
+import argparse
 import time
 import json
 from pathlib import Path
 from graph import DynamicGraph
-from classical_closeness import compute_all_closeness_classical
-from lecteur_graphe import to_int
+from classical_closeness import (compute_all_closeness_classical, ScopedClassicalGraph,
+                                 creer_pool, workers_depuis_environnement, VARIABLE_WORKERS)
+from lecteur_graphe import to_int, to_weight
 
 
-def classical_closeness_file(nom: str, input_dir: Path = None) -> dict:
+def classical_closeness_file(nom: str, input_dir: Path = None, workers: int = None,
+                             mode: str = "full", pool=None) -> dict:
 	"""
 	Traite un graphe dynamique avec l'algorithme CLASSIQUE.
 	À chaque étape, recalcule la closeness complète et mesure le temps.
@@ -21,6 +24,11 @@ def classical_closeness_file(nom: str, input_dir: Path = None) -> dict:
 	Args:
 		nom: Nom du fichier (ex: "graphe_1.txt")
 		input_dir: Dossier d'entrée (par défaut: data/)
+		workers: Nombre de processus pour le recalcul (None = séquentiel)
+		mode: "full" recalcule tous les nœuds à chaque étape ; "scoped" ne
+		      recalcule que la composante connexe touchée par l'action
+		pool: Pool de processus (creer_pool) partagé par toutes les étapes ;
+		      None = un pool est créé pour ce fichier si workers > 1
 	
 	Returns:
 		dict: {
@@ -29,6 +37,11 @@ def classical_closeness_file(nom: str, input_dir: Path = None) -> dict:
 			'cumulative_time': temps total
 		}
 	"""
+	if pool is None and workers is not None and workers > 1:
+		# Un seul pool pour toutes les étapes du fichier
+		with creer_pool(workers) as pool:
+			return classical_closeness_file(nom, input_dir, workers, mode, pool)
+	
 	# Déterminer les chemins
 	if input_dir is None:
 		input_dir = Path(__file__).parent.parent / "data"
@@ -40,11 +53,14 @@ def classical_closeness_file(nom: str, input_dir: Path = None) -> dict:
 		raise FileNotFoundError(f"Fichier {input_file} introuvable")
 	
 	print(f"\n{'='*80}")
-	print(f"TRAITEMENT CLASSIQUE: {nom}")
+	print(f"TRAITEMENT CLASSIQUE{' (composantes)' if mode == 'scoped' else ''}: {nom}")
 	print(f"{'='*80}\n")
 	
+	if mode not in ("full", "scoped"):
+		raise ValueError(f"Mode inconnu: {mode}")
+	
 	# Créer le graphe
-	G = DynamicGraph()
+	G = ScopedClassicalGraph(workers=workers, pool=pool) if mode == "scoped" else DynamicGraph()
 	
 	# Lire toutes les lignes
 	with open(input_file, 'r', encoding='utf-8') as f:
@@ -85,8 +101,17 @@ def classical_closeness_file(nom: str, input_dir: Path = None) -> dict:
 			u, v = to_int(parts[1]), to_int(parts[2])
 			G.remove_edge(u, v)
 		
-		# ⚠️ RECALCUL COMPLET de la closeness à chaque étape!
-		_ = compute_all_closeness_classical(G.G)
+		elif cmd == "updateEdge":
+			# Le recalcul passe par Dijkstra dès qu'un poids diffère de 1
+			u, v, w = to_int(parts[1]), to_int(parts[2]), to_weight(parts[3])
+			G.update_edge_weight(u, v, w)
+		
+		if mode == "scoped":
+			# Recalcul limité à la composante touchée, simple renormalisation ailleurs
+			_ = G.closeness()
+		else:
+			# ⚠️ RECALCUL COMPLET de la closeness à chaque étape!
+			_ = compute_all_closeness_classical(G.G, workers=workers, pool=pool)
 		
 		step_time = time.time() - start_time
 		time_per_step.append(step_time)
@@ -115,8 +140,13 @@ def classical_closeness_file(nom: str, input_dir: Path = None) -> dict:
 	}
 
 
-def main():
-	"""Traite tous les graphes avec l'algorithme classique."""
+def main(workers: int = None, mode: str = "full"):
+	"""
+	Traite tous les graphes avec l'algorithme classique.
+	workers: nombre de processus (None = variable CLOSENESS_WORKERS, séquentiel si absente)
+	"""
+	if workers is None:
+		workers = workers_depuis_environnement()
 	data_dir = Path(__file__).parent.parent / "data"
 	results_dir = Path(__file__).parent.parent / "results" / "logs_graph"
 	results_dir.mkdir(parents=True, exist_ok=True)
@@ -137,15 +167,17 @@ def main():
 	
 	all_results = {}
 	
-	for filename in test_files:
-		filepath = data_dir / filename
-		if filepath.exists():
-			try:
-				stats = classical_closeness_file(filename)
-				base_name = filename.replace('.txt', '')
-				all_results[base_name] = stats
-			except Exception as e:
-				print(f"❌ Erreur lors du traitement de {filename}: {e}\n")
+	# Les processus sont lancés une fois pour tous les graphes
+	with creer_pool(workers) as pool:
+		for filename in test_files:
+			filepath = data_dir / filename
+			if filepath.exists():
+				try:
+					stats = classical_closeness_file(filename, workers=workers, mode=mode, pool=pool)
+					base_name = filename.replace('.txt', '')
+					all_results[base_name] = stats
+				except Exception as e:
+					print(f"❌ Erreur lors du traitement de {filename}: {e}\n")
 	
 	# Sauvegarder tous les temps dans un fichier JSON
 	output_file = results_dir / "classical_times.json"
@@ -166,4 +198,10 @@ def main():
 
 
 if __name__ == "__main__":
-	main()
+	parser = argparse.ArgumentParser(description="Temps de l'algorithme classique sur les graphes de data/")
+	parser.add_argument("--workers", type=int, default=None,
+	                    help=f"nombre de processus (défaut : variable {VARIABLE_WORKERS}, sinon séquentiel)")
+	parser.add_argument("--mode", choices=("full", "scoped"), default="full",
+	                    help="full : recalcul complet à chaque étape ; scoped : composante touchée seulement")
+	args = parser.parse_args()
+	main(workers=args.workers, mode=args.mode)
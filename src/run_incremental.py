@@ -2,6 +2,7 @@ from pathlib import Path
 from incremental_closeness_article import IncrementalClosenessArticle
 from classical_closeness import compute_all_closeness_classical
 from graph import DynamicGraph
+from lecteur_graphe import to_weight
 import time
 
 
@@ -15,7 +16,7 @@ def to_int(s: str) -> int:
 def write_graph_state(graphe, filename: Path):
 	"""
 	Écrit la forme du graphe dans un fichier.
-	Format: Une ligne par arête "u v"
+	Format: Une ligne par arête "u v", ou "u v w" si son poids w diffère de 1
 	"""
 	with open(filename, 'w', encoding='utf-8') as f:
 		# Écrire les nœuds
@@ -27,11 +28,11 @@ def write_graph_state(graphe, filename: Path):
 		# Écrire les arêtes (non orientées = une seule fois)
 		f.write(f"# Edges: {graphe.G.number_of_edges() // 2}\n")
 		edges_seen = set()
-		for u, v in graphe.G.edges():
+		for u, v, w in graphe.G.edges(data='weight', default=1):
 			edge = tuple(sorted((u, v)))
 			if edge not in edges_seen:
 				edges_seen.add(edge)
-				f.write(f"n{u} n{v}\n")
+				f.write(f"n{u} n{v}\n" if w == 1 else f"n{u} n{v} {w}\n")
 
 
 def write_closeness_scores(closeness: dict, filename: Path):
@@ -69,7 +70,11 @@ def incremental_closeness_file(nom: str, input_dir: Path = None) -> dict:
 			'final_nodes': nombre de nœuds finaux,
 			'final_edges': nombre d'arêtes finales,
 			'time_per_step': liste des temps par étape,
-			'cumulative_time': temps cumulé total
+			'cumulative_time': temps cumulé total,
+			'wiener_index': indice de Wiener après chaque étape,
+			'connected_pairs': paires ordonnées connectées après chaque étape,
+			'average_path_length': longueur moyenne des chemins après chaque étape,
+			'strategies': nombre de mises à jour incrémentales / reconstructions
 		}
 	"""
 	# Déterminer les chemins
@@ -104,6 +109,9 @@ def incremental_closeness_file(nom: str, input_dir: Path = None) -> dict:
 	total_steps = len(lines)
 	time_per_step = []
 	cumulative_time = 0
+	wiener_index = []
+	connected_pairs = []
+	average_path_length = []
 	
 	print(f"Nombre d'étapes: {total_steps}")
 	print(f"Traitement en cours...\n")
@@ -136,6 +144,10 @@ def incremental_closeness_file(nom: str, input_dir: Path = None) -> dict:
 			u, v = to_int(parts[1]), to_int(parts[2])
 			incr.remove_undirected_edge(u, v)
 		
+		elif cmd == "updateEdge":
+			u, v, w = to_int(parts[1]), to_int(parts[2]), to_weight(parts[3])
+			incr.update_undirected_edge_weight(u, v, w)
+		
 		step_time = time.time() - start_time
 		time_per_step.append(step_time)
 		cumulative_time += step_time
@@ -143,6 +155,11 @@ def incremental_closeness_file(nom: str, input_dir: Path = None) -> dict:
 		# Obtenir la closeness actuelle
 		closeness = incr.get_all_closeness()
 		
+		# Agrégats globaux maintenus par le moteur (lecture en temps constant)
+		wiener_index.append(incr.get_wiener_index())
+		connected_pairs.append(incr.get_connected_pairs())
+		average_path_length.append(incr.get_average_path_length())
+		
 		# Sauvegarder l'état du graphe dans evolution/
 		graph_file = evolution_dir / f"{base_name}_{i}.txt"
 		
@@ -152,11 +169,13 @@ def incremental_closeness_file(nom: str, input_dir: Path = None) -> dict:
 			export_graph.add_node(node)
 		# Ajouter les arêtes (DiGraph -> Graph)
 		edges_added = set()
-		for u, v in incr.G.edges():
+		for u, v, w in incr.G.edges(data='weight', default=1):
 			edge = tuple(sorted((u, v)))
 			if edge not in edges_added:
 				edges_added.add(edge)
 				export_graph.add_edge(u, v)
+				if w != 1:
+					export_graph.update_edge_weight(u, v, w)
 		
 		write_graph_state(export_graph, graph_file)
 		
@@ -170,6 +189,7 @@ def incremental_closeness_file(nom: str, input_dir: Path = None) -> dict:
 			print(f"  Étape {i}/{total_steps} ({progress:.0f}%) - "
 			      f"Nœuds: {len(incr.G.nodes())}, "
 			      f"Arêtes: {incr.G.number_of_edges()//2}, "
+			      f"Longueur moyenne: {average_path_length[-1]:.3f}, "
 			      f"Temps cumulé: {cumulative_time:.3f}s")
 	
 	final_nodes = len(incr.G.nodes())
@@ -182,6 +202,11 @@ def incremental_closeness_file(nom: str, input_dir: Path = None) -> dict:
 	print(f"  - Arêtes finales: {final_edges}")
 	print(f"  - Temps total: {cumulative_time:.3f}s")
 	print(f"  - Temps moyen par étape: {cumulative_time/total_steps*1000:.2f}ms")
+	if total_steps:
+		print(f"  - Indice de Wiener final: {wiener_index[-1]}, "
+		      f"longueur moyenne des chemins: {average_path_length[-1]:.4f}")
+	print(f"  - Stratégies: {incr.compteurs_strategie['incremental']} incrémentales, "
+	      f"{incr.compteurs_strategie['rebuild']} reconstructions")
 	print(f"{'='*80}\n")
 	
 	return {
@@ -189,7 +214,11 @@ def incremental_closeness_file(nom: str, input_dir: Path = None) -> dict:
 		'final_nodes': final_nodes,
 		'final_edges': final_edges,
 		'time_per_step': time_per_step,
-		'cumulative_time': cumulative_time
+		'cumulative_time': cumulative_time,
+		'wiener_index': wiener_index,
+		'connected_pairs': connected_pairs,
+		'average_path_length': average_path_length,
+		'strategies': dict(incr.compteurs_strategie)
 	}
 
 
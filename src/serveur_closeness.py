@@ -0,0 +1,255 @@
+"""
+Service asyncio autour de IncrementalClosenessArticle.
+
+Le serveur écoute sur une socket Unix ou TCP locale. Chaque ligne reçue
+est une requête, et les réponses sont renvoyées dans l'ordre des requêtes
+(un client peut en envoyer plusieurs sans attendre les réponses) :
+
+    addNode nX | removeNode nX | addEdge nX nY | removeEdge nX nY
+    updateEdge nX nY w                  -> ok
+    closeness nX                        -> <closeness>
+    topk K                              -> nA cA nB cB ... (K meilleurs nœuds)
+    stats                               -> nodes=.. edges=.. pairs=.. wiener=.. apl=..
+
+Une erreur donne « error <message> » sans fermer la connexion.
+
+Toutes les requêtes passent par une file unique traitée par une tâche
+moteur. Les requêtes arrivées pendant le traitement du lot précédent
+forment le lot suivant. Le moteur est en mode différé : les modifications
+d'un lot sont journalisées puis appliquées en une fois (effet net, choix
+incrémental / reconstruction) avant la première requête de lecture qui
+les suit. Le calcul s'exécute dans un thread, ce qui laisse la boucle
+asyncio lire les requêtes suivantes pendant ce temps.
+
+Avec un journal (journal_wal.JournalWAL), chaque modification appliquée est
+notée dans le journal, synchronisé sur disque en fin de lot avant l'envoi
+des réponses ; un point de reprise est écrit tous les
+operations_par_checkpoint opérations.
+"""
+
+import asyncio
+import heapq
+import logging
+
+from incremental_closeness_article import IncrementalClosenessArticle
+from lecteur_graphe import to_weight
+from run_incremental import to_int
+
+logger = logging.getLogger(__name__)
+
+
+def appliquer_action(incr, parts):
+    """
+    Applique une action au format des fichiers de graphes dynamiques
+    (parts = ligne découpée) au moteur incrémental.
+
+    Returns:
+        bool: False si parts[0] n'est pas une action connue
+    """
+    cmd = parts[0]
+    if cmd == "addNode":
+        incr.add_node(to_int(parts[1]))
+    elif cmd == "removeNode":
+        incr.remove_node(to_int(parts[1]))
+    elif cmd == "addEdge":
+        incr.add_undirected_edge(to_int(parts[1]), to_int(parts[2]))
+    elif cmd == "removeEdge":
+        incr.remove_undirected_edge(to_int(parts[1]), to_int(parts[2]))
+    elif cmd == "updateEdge":
+        incr.update_undirected_edge_weight(to_int(parts[1]), to_int(parts[2]), to_weight(parts[3]))
+    else:
+        return False
+    return True
+
+
+class ServeurCloseness:
+    """
+    Serveur de closeness : une file de requêtes, un moteur, des lots.
+
+    Args:
+        incr: moteur servi (par défaut : moteur vide, ou celui reconstruit
+            par journal.recuperer())
+        journal: JournalWAL optionnel rendant les modifications durables
+    """
+
+    def __init__(self, incr=None, journal=None):
+        self.journal = journal
+        if incr is None:
+            incr = journal.recuperer() if journal is not None else IncrementalClosenessArticle()
+        self.incr = incr
+        self.incr.set_deferred(True)
+        self.file = None
+        self.lots = 0  # nombre de lots traités (observabilité, tests)
+        self._moteur = None
+
+    async def demarrer(self, path=None, host="127.0.0.1", port=0):
+        """
+        Démarre l'écoute sur la socket Unix path, ou à défaut en TCP sur
+        host:port (port=0 : port libre choisi par le système). Plusieurs
+        écoutes partagent la même file et le même moteur.
+
+        Returns:
+            asyncio.Server (server.sockets[0].getsockname() donne l'adresse)
+        """
+        if self._moteur is None:
+            self.file = asyncio.Queue()
+            self._moteur = asyncio.ensure_future(self._boucle_moteur())
+        if path is not None:
+            return await asyncio.start_unix_server(self._client, path=path)
+        return await asyncio.start_server(self._client, host=host, port=port)
+
+    async def arreter(self):
+        """Arrête la tâche moteur (à appeler après server.close())."""
+        if self._moteur is not None:
+            self._moteur.cancel()
+            try:
+                await self._moteur
+            except asyncio.CancelledError:
+                pass
+            self._moteur = None
+
+    async def _client(self, reader, writer):
+        """
+        Lit les requêtes d'un client sans attendre leurs réponses ; une
+        tâche d'envoi écrit les réponses dans l'ordre des requêtes.
+        """
+        reponses = asyncio.Queue()
+        envoi = asyncio.ensure_future(self._envoyer(reponses, writer))
+        try:
+            while True:
+                ligne = await reader.readline()
+                if not ligne:
+                    break
+                ligne = ligne.decode("utf-8").strip()
+                if not ligne:
+                    continue
+                futur = asyncio.get_running_loop().create_future()
+                await self.file.put((ligne, futur))
+                await reponses.put(futur)
+        finally:
+            await reponses.put(None)
+            await envoi
+
+    async def _envoyer(self, reponses, writer):
+        try:
+            while True:
+                futur = await reponses.get()
+                if futur is None:
+                    break
+                writer.write((await futur + "\n").encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _boucle_moteur(self):
+        """Regroupe les requêtes en attente en un lot et le traite dans un thread."""
+        loop = asyncio.get_running_loop()
+        while True:
+            lot = [await self.file.get()]
+            while not self.file.empty():
+                lot.append(self.file.get_nowait())
+            try:
+                resultats = await loop.run_in_executor(None, self._traiter_lot, [l for l, _ in lot])
+            except Exception as e:
+                # Échec hors des requêtes (vidage, fsync du journal...) : tout
+                # le lot est en erreur, la boucle continue avec le suivant
+                logger.exception("Échec du traitement d'un lot")
+                resultats = [f"error {e}"] * len(lot)
+            self.lots += 1
+            for (_, futur), resultat in zip(lot, resultats):
+                if not futur.done():
+                    futur.set_result(resultat)
+
+    def _traiter_lot(self, lignes):
+        """
+        Traite un lot dans l'ordre. Les modifications sont journalisées
+        (mode différé) ; une lecture vide le journal avant de répondre, et
+        le journal restant est vidé en fin de lot. Avec un journal WAL, les
+        modifications du lot sont rendues durables avant de renvoyer les
+        réponses.
+        """
+        resultats = []
+        for ligne in lignes:
+            try:
+                resultats.append(self._traiter(ligne.split()))
+            except (ValueError, IndexError, KeyError) as e:
+                resultats.append(f"error {e}")
+        self.incr.flush()
+        if self.journal is not None:
+            self.journal.synchroniser()
+            if self.journal.doit_checkpoint():
+                self.journal.checkpoint(self.incr)
+        return resultats
+
+    def _traiter(self, parts):
+        cmd = parts[0]
+        if appliquer_action(self.incr, parts):
+            if self.journal is not None:
+                self.journal.noter(" ".join(parts))
+            return "ok"
+        if cmd == "closeness":
+            return f"{self.incr.get_closeness(to_int(parts[1])):.10f}"
+        if cmd == "topk":
+            k = int(parts[1])
+            meilleurs = heapq.nlargest(k, self.incr.get_all_closeness().items(), key=lambda p: p[1])
+            return " ".join(f"n{x} {c:.10f}" for x, c in meilleurs)
+        if cmd == "stats":
+            self.incr.flush()
+            return (f"nodes={len(self.incr.G)} edges={self.incr.G.number_of_edges() // 2} "
+                    f"pairs={self.incr.get_connected_pairs()} wiener={self.incr.get_wiener_index()} "
+                    f"apl={self.incr.get_average_path_length():.10f}")
+        raise ValueError(f"commande inconnue: {cmd}")
+
+
+async def client_local(requetes, path=None, host="127.0.0.1", port=None):
+    """
+    Client minimal : envoie toutes les requêtes d'un coup (pipeline) puis
+    lit autant de réponses.
+
+    Returns:
+        list: réponses, dans l'ordre des requêtes
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    writer.write("".join(r + "\n" for r in requetes).encode("utf-8"))
+    await writer.drain()
+    reponses = [(await reader.readline()).decode("utf-8").rstrip("\n") for _ in requetes]
+    writer.close()
+    await writer.wait_closed()
+    return reponses
+
+
+def main():
+    """
+    Lance le serveur en TCP sur 127.0.0.1:8765 jusqu'à interruption. Un
+    dossier passé en argument active le journal WAL et la reprise.
+    """
+    import sys
+
+    journal = None
+    if len(sys.argv) > 1:
+        from journal_wal import JournalWAL
+        journal = JournalWAL(sys.argv[1])
+
+    async def servir():
+        serveur = ServeurCloseness(journal=journal)
+        server = await serveur.demarrer(port=8765)
+        print(f"Serveur de closeness à l'écoute sur {server.sockets[0].getsockname()}")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(servir())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if journal is not None:
+            journal.fermer()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,12 @@ Pour chaque étape i:
 4. Signale toute différence > seuil de tolérance
 """
 
+import argparse
 from pathlib import Path
 import networkx as nx
-from classical_closeness import compute_all_closeness_classical
-from lecteur_graphe import to_int
+from classical_closeness import (compute_all_closeness_classical, creer_pool,
+                                 workers_depuis_environnement, VARIABLE_WORKERS)
+from lecteur_graphe import to_int, to_weight
 import time
 
 
@@ -42,11 +44,12 @@ def load_graph_from_evolution(filepath: Path):
 			G.add_node(node)
 		elif mode == 'edges':
 			parts = line.split()
-			if len(parts) == 2:
+			if len(parts) in (2, 3):
 				u, v = to_int(parts[0]), to_int(parts[1])
+				w = to_weight(parts[2]) if len(parts) == 3 else 1
 				# Arête non orientée = 2 arcs
-				G.add_edge(u, v)
-				G.add_edge(v, u)
+				G.add_edge(u, v, weight=w)
+				G.add_edge(v, u, weight=w)
 	
 	return G
 
@@ -72,9 +75,11 @@ def load_scores_from_file(filepath: Path) -> dict:
 
 
 def verify_single_step(base_name: str, step: int, evolution_dir: Path, scores_dir: Path, 
-                       tolerance: float = 1e-9) -> dict:
+                       tolerance: float = 1e-9, workers: int = None, pool=None) -> dict:
 	"""
 	Vérifie une étape unique.
+	workers: nombre de processus pour le calcul classique (None = séquentiel)
+	pool: pool de processus réutilisé (creer_pool), None = créé pour l'étape
 	
 	Returns:
 		dict: {
@@ -101,7 +106,7 @@ def verify_single_step(base_name: str, step: int, evolution_dir: Path, scores_di
 	incremental_scores = load_scores_from_file(score_file)
 	
 	# Calculer avec classique
-	classical_scores = compute_all_closeness_classical(G)
+	classical_scores = compute_all_closeness_classical(G, workers=workers, pool=pool)
 	
 	# Comparer
 	mismatches = []
@@ -134,7 +139,7 @@ def verify_single_step(base_name: str, step: int, evolution_dir: Path, scores_di
 
 
 def verify_all_steps(base_name: str, total_steps: int, tolerance: float = 1e-9, 
-                     sample_rate: int = 1) -> dict:
+                     sample_rate: int = 1, workers: int = None, pool=None) -> dict:
 	"""
 	Vérifie toutes les étapes d'un graphe dynamique.
 	
@@ -143,10 +148,18 @@ def verify_all_steps(base_name: str, total_steps: int, tolerance: float = 1e-9,
 		total_steps: Nombre total d'étapes
 		tolerance: Seuil de tolérance pour la comparaison
 		sample_rate: Vérifier 1 étape sur N (1 = toutes, 10 = 1/10)
+		workers: Nombre de processus pour le calcul classique (None = séquentiel)
+		pool: Pool de processus (creer_pool) partagé par les étapes ; None = un
+		      pool est créé pour ce graphe si workers > 1
 	
 	Returns:
 		dict: Statistiques complètes de la vérification
 	"""
+	if pool is None and workers is not None and workers > 1:
+		# Un seul pool pour toutes les étapes vérifiées
+		with creer_pool(workers) as pool:
+			return verify_all_steps(base_name, total_steps, tolerance, sample_rate, workers, pool)
+	
 	results_dir = Path(__file__).parent.parent / "results" / "logs_graph"
 	evolution_dir = results_dir / "evolution"
 	scores_dir = results_dir / "scores"
@@ -165,7 +178,7 @@ def verify_all_steps(base_name: str, total_steps: int, tolerance: float = 1e-9,
 	start_time = time.time()
 	
 	for i, step in enumerate(steps_to_check, 1):
-		result = verify_single_step(base_name, step, evolution_dir, scores_dir, tolerance)
+		result = verify_single_step(base_name, step, evolution_dir, scores_dir, tolerance, workers, pool)
 		
 		if 'error' in result:
 			errors.append(result)
@@ -224,8 +237,13 @@ def verify_all_steps(base_name: str, total_steps: int, tolerance: float = 1e-9,
 	}
 
 
-def main():
-	"""Fonction de test."""
+def main(workers: int = None):
+	"""
+	Fonction de test.
+	workers: nombre de processus (None = variable CLOSENESS_WORKERS, séquentiel si absente)
+	"""
+	if workers is None:
+		workers = workers_depuis_environnement()
 	# Vérifier les 10 graphes générés avec noms descriptifs
 	test_cases = [
 		("graphe_equilibre", 1500),
@@ -242,9 +260,12 @@ def main():
 	
 	all_stats = {}
 	
-	for base_name, total_steps in test_cases:
-		stats = verify_all_steps(base_name, total_steps, tolerance=1e-9, sample_rate=10)  # Échantillonner 1/10 pour être plus rapide
-		all_stats[base_name] = stats
+	# Les processus sont lancés une fois pour tous les graphes
+	with creer_pool(workers) as pool:
+		for base_name, total_steps in test_cases:
+			stats = verify_all_steps(base_name, total_steps, tolerance=1e-9, sample_rate=10,
+			                         workers=workers, pool=pool)  # Échantillonner 1/10 pour être plus rapide
+			all_stats[base_name] = stats
 	
 	# Résumé global
 	print("\n" + "="*80)
@@ -264,4 +285,8 @@ def main():
 
 
 if __name__ == "__main__":
-	main()
+	parser = argparse.ArgumentParser(description="Compare les scores incrémentaux au calcul classique")
+	parser.add_argument("--workers", type=int, default=None,
+	                    help=f"nombre de processus (défaut : variable {VARIABLE_WORKERS}, sinon séquentiel)")
+	args = parser.parse_args()
+	main(workers=args.workers)
@@ -0,0 +1,80 @@
+"""
+Tests de non-régression du moteur incrémental (python -m pytest tests).
+
+Chaque état est comparé à un recalcul complet par Dijkstra (NetworkX).
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import networkx as nx
+
+# Les modules du projet sont dans src
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from incremental_closeness_article import IncrementalClosenessArticle
+
+
+def verifier_etat(incr):
+    """Compare D, TotDist, les agrégats et C au recalcul complet."""
+    H = nx.DiGraph()
+    H.add_nodes_from(incr.G)
+    H.add_weighted_edges_from((u, v, incr.W[u][v]) for u, v in incr.G.edges())
+    n = len(H)
+    for s in H:
+        attendu = nx.single_source_dijkstra_path_length(H, s)
+        assert incr.D[s] == attendu, (s, incr.D[s], attendu)
+        assert incr.TotDist[s] == sum(attendu.values())
+        r, total = len(attendu) - 1, sum(attendu.values())
+        c = (r / total) * (r / (n - 1)) if r and total and n > 1 else 0.0
+        assert abs(incr.C[s] - c) < 1e-9, (s, incr.C[s], c)
+    assert incr.SommeDist == sum(sum(ligne.values()) for ligne in incr.D.values())
+    assert incr.NbPaires == sum(len(ligne) - 1 for ligne in incr.D.values())
+
+
+def test_pont_de_poids_nul():
+    # Pont 0--1 de poids 0 : d(0,x) = d(1,x) pour tout x, les côtés du pont
+    # ne se déduisent pas des distances
+    incr = IncrementalClosenessArticle()
+    incr.add_undirected_edge(0, 1, 0)
+    incr.add_undirected_edge(1, 2)
+    incr.remove_undirected_edge(0, 1)
+    assert incr.D[0] == {0: 0}
+    assert incr.C[0] == 0.0
+    verifier_etat(incr)
+
+
+def test_suppression_noeud_pont_de_poids_nul():
+    incr = IncrementalClosenessArticle()
+    incr.add_undirected_edge(0, 1, 0)
+    incr.add_undirected_edge(1, 2, 0)
+    incr.add_undirected_edge(2, 3)
+    incr.remove_node(1)
+    verifier_etat(incr)
+
+
+def test_flux_aleatoire_avec_poids_nuls():
+    for graine in range(20):
+        rng = random.Random(graine)
+        incr = IncrementalClosenessArticle()
+        for x in range(10):
+            incr.add_node(x)
+        for _ in range(150):
+            r = rng.random()
+            aretes = [(u, v) for u, v in incr.G.edges() if u < v]
+            if r < 0.5:
+                u, v = rng.sample(range(10), 2)
+                if not incr.G.has_edge(u, v):
+                    incr.add_undirected_edge(u, v, rng.choice([0, 0, 1, 2]))
+            elif r < 0.8 and aretes:
+                u, v = rng.choice(aretes)
+                incr.remove_undirected_edge(u, v, incr.W[u][v])
+            elif r < 0.9 and aretes:
+                u, v = rng.choice(aretes)
+                incr.update_undirected_edge_weight(u, v, rng.choice([0, 1, 3]))
+            else:
+                x = rng.randrange(10)
+                incr.remove_node(x)
+                incr.add_node(x)
+            verifier_etat(incr)